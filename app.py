@@ -2,16 +2,99 @@
 Flask web server for Connect 4 game with GUI.
 """
 
+from collections import OrderedDict
+import threading
+from typing import Optional
+
 from flask import Flask, render_template, jsonify, request
 from game import Connect4, Player
-from bot import Bot
+from bot import Bot, SearchContext
 import json
 
 app = Flask(__name__)
 
-# Store game instances in memory (in production, use a proper session store)
-games = {}
+# Store game instances in memory (in production, use a proper session store).
+# Games are kept in least recently used order and the oldest is dropped once
+# there are more than MAX_GAMES; _games_lock guards every access.
+MAX_GAMES = 10_000
+games = OrderedDict()
+_games_lock = threading.Lock()
+
+# The bot is shared by all games; a game gets its own search context on its
+# first bot move, so the bot's transposition table carries over between that
+# game's moves. Each context holds a whole transposition table, so only the
+# MAX_SEARCH_CONTEXTS most recently used are kept (also under _games_lock); a
+# game whose context was dropped gets a new one on its next bot move.
+MAX_SEARCH_CONTEXTS = 64
 bot = Bot(depth=6, player=Player.YELLOW)
+search_contexts = OrderedDict()
+
+# Per-game locks held across a move's checks and the move itself, so that
+# concurrent requests for one game can't both pass the turn check or search
+# on the same context at once
+game_locks = {}
+
+
+def _get_game(game_id: str) -> Optional[Connect4]:
+    """Look up a game and mark it as recently used."""
+    with _games_lock:
+        game = games.get(game_id)
+        if game is not None:
+            games.move_to_end(game_id)
+        return game
+
+
+def _add_game(game_id: str, game: Connect4) -> None:
+    """Store a game, evicting the least recently used one if over MAX_GAMES."""
+    with _games_lock:
+        games[game_id] = game
+        games.move_to_end(game_id)
+        # A restarted game keeps its search context: table entries are keyed
+        # by position, so they hold for any game, and the killers are cleared
+        # after every search
+        if len(games) > MAX_GAMES:
+            evicted_id, _ = games.popitem(last=False)
+            search_contexts.pop(evicted_id, None)
+            game_locks.pop(evicted_id, None)
+
+
+def _get_game_lock(game_id: str) -> threading.Lock:
+    """Get the lock serializing the moves of a game, creating it on first use."""
+    with _games_lock:
+        lock = game_locks.get(game_id)
+        if lock is None:
+            lock = game_locks[game_id] = threading.Lock()
+        return lock
+
+
+def _get_search_context(game_id: str) -> SearchContext:
+    """Get the bot's search context for a game, creating it on first use."""
+    with _games_lock:
+        context = search_contexts.get(game_id)
+        if context is not None:
+            search_contexts.move_to_end(game_id)
+            return context
+    
+    # Allocate the transposition table without holding the lock
+    context = SearchContext()
+    with _games_lock:
+        if game_id not in games:
+            return context  # Evicted meanwhile; don't keep a context for it
+        context = search_contexts.setdefault(game_id, context)
+        search_contexts.move_to_end(game_id)
+        if len(search_contexts) > MAX_SEARCH_CONTEXTS:
+            search_contexts.popitem(last=False)
+        return context
+
+
+def _game_state(game: Connect4) -> dict:
+    """Serialize the public state of a game for an API response."""
+    return {
+        'board': game.get_board(),
+        'current_player': game.current_player,
+        'game_over': game.game_over,
+        'winner': game.winner
+    }
 
 
 @app.route('/')
@@ -23,97 +106,77 @@ def index():
 @app.route('/api/new_game', methods=['POST'])
 def new_game():
     """Create a new game."""
-    game_id = request.json.get('game_id', 'default')
+    game_id = request.get_json(cache=True).get('game_id', 'default')
     game = Connect4()
-    games[game_id] = game
-    return jsonify({
-        'success': True,
-        'board': game.get_board(),
-        'current_player': game.current_player.value,
-        'game_over': game.game_over,
-        'winner': game.winner.value
-    })
+    _add_game(game_id, game)
+    return jsonify({'success': True, **_game_state(game)})
 
 
 @app.route('/api/move', methods=['POST'])
 def make_move():
     """Make a player move."""
-    data = request.json
+    data = request.get_json(cache=True)
     game_id = data.get('game_id', 'default')
     col = data.get('col')
     
-    if game_id not in games:
+    game = _get_game(game_id)
+    if game is None:
         return jsonify({'success': False, 'error': 'Game not found'}), 404
     
-    game = games[game_id]
-    
     if col is None or col < 0 or col >= Connect4.COLS:
         return jsonify({'success': False, 'error': 'Invalid column'}), 400
     
-    if not game.is_valid_move(col):
-        return jsonify({'success': False, 'error': 'Invalid move'}), 400
-    
-    success = game.make_move(col)
-    
-    if not success:
-        return jsonify({'success': False, 'error': 'Move failed'}), 400
-    
-    response = {
-        'success': True,
-        'board': game.get_board(),
-        'current_player': game.current_player.value,
-        'game_over': game.game_over,
-        'winner': game.winner.value
-    }
-    
-    return jsonify(response)
+    with _get_game_lock(game_id):
+        if not game.is_valid_move(col):
+            return jsonify({'success': False, 'error': 'Invalid move'}), 400
+        
+        success = game.make_move(col)
+        
+        if not success:
+            return jsonify({'success': False, 'error': 'Move failed'}), 400
+        
+        return jsonify({'success': True, **_game_state(game)})
 
 
 @app.route('/api/bot_move', methods=['POST'])
 def bot_move():
     """Get and make the bot's move."""
-    data = request.json
+    data = request.get_json(cache=True)
     game_id = data.get('game_id', 'default')
     
-    if game_id not in games:
+    game = _get_game(game_id)
+    if game is None:
         return jsonify({'success': False, 'error': 'Game not found'}), 404
     
-    game = games[game_id]
-    
-    if game.game_over:
-        return jsonify({
-            'success': False,
-            'error': 'Game is over',
-            'board': game.get_board(),
-            'winner': game.winner.value
-        }), 400
-    
-    if game.current_player != bot.player:
-        return jsonify({
-            'success': False,
-            'error': 'Not bot\'s turn'
-        }), 400
-    
-    # Get bot's move
-    bot_col = bot.get_best_move(game)
-    
-    if bot_col is None:
-        return jsonify({'success': False, 'error': 'No valid moves'}), 400
-    
-    # Make the move
-    success = game.make_move(bot_col)
-    
-    if not success:
-        return jsonify({'success': False, 'error': 'Bot move failed'}), 400
-    
-    return jsonify({
-        'success': True,
-        'col': bot_col,
-        'board': game.get_board(),
-        'current_player': game.current_player.value,
-        'game_over': game.game_over,
-        'winner': game.winner.value
-    })
+    # Hold the game's lock from the turn check until the bot's move is made
+    with _get_game_lock(game_id):
+        if game.game_over:
+            return jsonify({
+                'success': False,
+                'error': 'Game is over',
+                'board': game.get_board(),
+                'winner': game.winner
+            }), 400
+        
+        if game.current_player != bot.player:
+            return jsonify({
+                'success': False,
+                'error': 'Not bot\'s turn'
+            }), 400
+        
+        # Get bot's move
+        bot_col = bot.get_best_move(game, _get_search_context(game_id))
+        
+        if bot_col is None:
+            return jsonify({'success': False, 'error': 'No valid moves'}), 400
+        
+        # Make the move
+        success = game.make_move(bot_col)
+        
+        if not success:
+            return jsonify({'success': False, 'error': 'Bot move failed'}), 400
+        
+        return jsonify({'success': True, 'col': bot_col, **_game_state(game)})
 
 
 @app.route('/api/game_state', methods=['GET'])
@@ -121,18 +184,11 @@ def get_game_state():
     """Get the current game state."""
     game_id = request.args.get('game_id', 'default')
     
-    if game_id not in games:
+    game = _get_game(game_id)
+    if game is None:
         return jsonify({'success': False, 'error': 'Game not found'}), 404
     
-    game = games[game_id]
-    
-    return jsonify({
-        'success': True,
-        'board': game.get_board(),
-        'current_player': game.current_player.value,
-        'game_over': game.game_over,
-        'winner': game.winner.value
-    })
+    return jsonify({'success': True, **_game_state(game)})
 
 
 if __name__ == '__main__':
@@ -2,35 +2,337 @@
 Optimal Connect 4 bot using minimax algorithm with alpha-beta pruning.
 """
 
-import random
+import time
+from concurrent.futures import Executor
 from typing import Optional, Tuple, Dict
-from enum import Enum
-from game import Connect4, Player
+from game import (Connect4, Player, NONE, RED, YELLOW, BOARD_BITS, BOARD_MASK,
+                  WIN_SHIFTS, ZOBRIST, SIDE_KEY, check_win)
 
 
-class BoundType(Enum):
-    """Type of bound stored in transposition table."""
-    EXACT = 0
-    LOWER_BOUND = 1
-    UPPER_BOUND = 2
+# Center columns are more valuable, so they are searched first (the left one
+# of two equally central columns first): (3, 2, 4, 1, 5, 0, 6) on 7 columns
+CENTER_ORDER = tuple(sorted(range(Connect4.COLS),
+                            key=lambda col: abs(2 * col - (Connect4.COLS - 1))))
 
+# Score of a won position, plus the remaining depth so faster wins score higher.
+# It is above any heuristic score (at most 69 lines of three, see POW10), and
+# every search score fits in 16 bits.
+WIN_SCORE = 10000
 
-class TranspositionEntry:
-    """Entry in the transposition table."""
-    def __init__(self, score: float, depth: int, bound: BoundType, best_move: Optional[int] = None):
-        self.score = score
-        self.depth = depth
-        self.bound = bound
-        self.best_move = best_move
+# Scores at least this far from zero are wins or losses: a win found below
+# a position is at most one move per cell away
+WIN_THRESHOLD = WIN_SCORE - Connect4.ROWS * Connect4.COLS
+
+# Bound on every score, used as the initial search window
+INF = 1_000_000_000
+
+# Half-width of the score window iterative deepening searches around the
+# previous iteration's score. The heuristic swings by tens between odd and
+# even depths, so narrower windows fail and re-search too often.
+ASPIRATION_WINDOW = 100
+
+
+def _line_mask(row: int, col: int, dr: int, dc: int) -> int:
+    """Get the bitboard mask of the 4-in-a-row line starting at (row, col)."""
+    mask = 0
+    for i in range(Connect4.WIN_LENGTH):
+        r = row + dr * i
+        c = col + dc * i
+        mask |= 1 << (c * Connect4.H1 + Connect4.ROWS - 1 - r)
+    return mask
+
+
+def _all_line_masks() -> Tuple[int, ...]:
+    """Build the mask of every 4-in-a-row line that fits on the board."""
+    rows, cols, win_length = Connect4.ROWS, Connect4.COLS, Connect4.WIN_LENGTH
+    masks = []
+    for row in range(rows):
+        for col in range(cols):
+            # Horizontal, vertical, diagonal /, diagonal \
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + dr * (win_length - 1)
+                end_col = col + dc * (win_length - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    masks.append(_line_mask(row, col, dr, dc))
+    return tuple(masks)
+
+
+# Every possible winning line (69 on a standard board)
+LINES = _all_line_masks()
+
+# Score of a line holding n pieces of only one player (four in a row is a
+# win, scored by the search instead)
+POW10 = (0, 1, 10, 100, 1000)
+
+# Score of a line for the bot, indexed [bot pieces][opponent pieces]: lines
+# holding both players' pieces score nothing
+LINE_SCORE = tuple(
+    tuple(POW10[bot_count] if opponent_count == 0 else
+          -POW10[opponent_count] if bot_count == 0 else 0
+          for opponent_count in range(Connect4.WIN_LENGTH + 1))
+    for bot_count in range(Connect4.WIN_LENGTH + 1)
+)
+
+
+def _line_starts(shift: int) -> int:
+    """Get the bitboard of the first cell of every line in one direction."""
+    starts = 0
+    for mask in LINES:
+        first = mask & -mask
+        if mask == first | first << shift | first << 2 * shift | first << 3 * shift:
+            starts |= first
+    return starts
+
+
+# For each direction in WIN_SHIFTS: the first cell of every line, and the bit
+# distances from it to the line's other three cells
+LINE_SPANS = tuple((_line_starts(shift), shift, 2 * shift, 3 * shift)
+                   for shift in WIN_SHIFTS)
+
+
+def _score_lines(bb: int, free: int) -> int:
+    """
+    Score the lines that hold one player's pieces and none of the other's.
+    
+    All lines of a direction are counted at once: shifting the bitboard by
+    0-3 cell steps lines up each line's four cells on its first cell, and a
+    bitwise adder over the four copies leaves every line's piece count on
+    that bit (as separate ones, twos and four-in-a-row bitboards).
+    
+    Args:
+        bb: Bitboard of the player's pieces
+        free: Bitboard of the cells the other player does not hold
+        
+    Returns:
+        Sum of POW10[count] over the player's lines
+    """
+    singles = doubles = triples = fours = 0
+    for starts, s1, s2, s3 in LINE_SPANS:
+        open_lines = starts & free & (free >> s1) & (free >> s2) & (free >> s3)
+        a1 = bb >> s1
+        a2 = bb >> s2
+        a3 = bb >> s3
+        both01 = bb & a1
+        both23 = a2 & a3
+        odd01 = bb ^ a1
+        odd23 = a2 ^ a3
+        ones = open_lines & (odd01 ^ odd23)
+        twos = open_lines & (both01 ^ both23 ^ (odd01 & odd23))
+        threes = ones & twos
+        singles += (ones ^ threes).bit_count()
+        doubles += (twos ^ threes).bit_count()
+        triples += threes.bit_count()
+        fours += (open_lines & both01 & both23).bit_count()
+    return (POW10[1] * singles + POW10[2] * doubles
+            + POW10[3] * triples + POW10[4] * fours)
+
+
+def evaluate_position(bot_bb: int, opponent_bb: int) -> int:
+    """
+    Evaluate a position without terminal conditions.
+    Heuristic: count potential winning lines for each player.
+    
+    Args:
+        bot_bb: Bitboard of the bot's pieces
+        opponent_bb: Bitboard of the opponent's pieces
+        
+    Returns:
+        Evaluation score (positive favors bot, negative favors opponent)
+    """
+    return (_score_lines(bot_bb, BOARD_MASK ^ opponent_bb)
+            - _score_lines(opponent_bb, BOARD_MASK ^ bot_bb))
+
+
+def evaluate_line(bot_bb: int, opponent_bb: int, row: int, col: int,
+                  dr: int, dc: int) -> int:
+    """
+    Evaluate a potential 4-in-a-row line.
+    
+    Args:
+        bot_bb: Bitboard of the bot's pieces
+        opponent_bb: Bitboard of the opponent's pieces
+        row: Starting row
+        col: Starting column
+        dr: Row direction
+        dc: Column direction
+        
+    Returns:
+        Score contribution from this line
+    """
+    mask = _line_mask(row, col, dr, dc)
+    return LINE_SCORE[(bot_bb & mask).bit_count()][(opponent_bb & mask).bit_count()]
+
+
+# Kinds of score stored in the transposition table
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class SearchContext:
+    """
+    Mutable state of a search: transposition table, caches and counters.
+    
+    Keeping this out of Bot lets one Bot serve concurrent searches. Passing
+    the same context to successive searches of a game keeps its
+    transposition table and history warm between moves.
+    
+    The transposition table is a fixed number of slots held as parallel
+    lists (key, score, depth, bound, best move, age). A position goes in the
+    slot given by the low bits of its hash and a lookup only hits if the
+    stored key matches. A slot filled by an earlier search (an older age) is
+    always replaced; one filled by the current search only by a result at
+    least as deep.
+    """
+    
+    # Default number of transposition table slots (a power of two). A depth 6
+    # search fills a few hundred slots, and the table is allocated up front for
+    # every context, so it is kept small.
+    TT_SIZE = 1 << 12
+    
+    __slots__ = ('tt_mask', 'tt_key', 'tt_score', 'tt_depth', 'tt_bound', 'tt_move',
+                 'tt_age', 'age', 'evaluation_cache', 'killers', 'history', 'nodes',
+                 'deadline')
+    
+    def __init__(self, deadline: Optional[float] = None, tt_size: Optional[int] = None):
+        """
+        Initialize an empty search context.
+        
+        Args:
+            deadline: time.perf_counter() value after which iterative
+                deepening starts no new iteration (default: no limit)
+            tt_size: Number of transposition table slots, a power of two
+                (default: TT_SIZE)
+        """
+        size = tt_size or self.TT_SIZE
+        if size & (size - 1):
+            raise ValueError("tt_size must be a power of two")
+        self.tt_mask = size - 1
+        self.tt_key: list = [None] * size
+        self.tt_score: list = [0] * size
+        self.tt_depth: list = [0] * size
+        self.tt_bound: list = [EXACT] * size
+        self.tt_move: list = [None] * size
+        self.tt_age: list = [0] * size
+        
+        # Number of the current search, bumped by each get_best_move call
+        self.age = 0
+        
+        # Cache for evaluation scores (keyed by position hash)
+        self.evaluation_cache: Dict[int, int] = {}
+        
+        # Killer moves (the last two moves to cause a cutoff, most recent
+        # first), indexed by remaining depth. Searches go no deeper than the
+        # empty cells, so the context suits bots of any depth.
+        self.killers: list = [[None, None]
+                              for _ in range(Connect4.ROWS * Connect4.COLS + 1)]
+        
+        # History heuristic: cutoffs caused by each column, weighted by the
+        # square of the remaining depth
+        self.history: list = [0] * Connect4.COLS
+        
+        # Number of positions searched
+        self.nodes = 0
+        
+        self.deadline = deadline
+    
+    def record_cutoff(self, depth: int, move: int) -> None:
+        """
+        Remember a move that caused a beta cutoff.
+        
+        Args:
+            depth: Remaining depth of the position the cutoff happened in
+            move: Column that caused the cutoff
+        """
+        killers = self.killers[depth]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[move] += depth * depth
+    
+    def clear_search_caches(self) -> None:
+        """
+        Drop the evaluation cache and killers of a search.
+        
+        The transposition table and history stay: they are what a context
+        kept between a game's moves is for. The evaluation cache would
+        otherwise hold every leaf of the last search, and the killers are
+        indexed by remaining depth, which points at different plies once
+        the root has moved on.
+        """
+        self.evaluation_cache.clear()
+        for killers in self.killers:
+            killers[0] = killers[1] = None
+    
+    def store_entry(self, position_hash: int, score: int, depth: int, bound: int,
+                    best_move: Optional[int] = None) -> None:
+        """
+        Store a search result in the position's transposition table slot.
+        
+        Win and loss scores count the remaining depth of the node where the
+        game ended, which depends on how far the search root is. They are
+        stored relative to this position instead (as WIN_SCORE minus the
+        moves to the win), so a later search from another root can use them;
+        probes add their own remaining depth back.
+        
+        Args:
+            position_hash: Hash of the position
+            score: Score of the position for the side to move
+            depth: Remaining depth the position was searched to
+            bound: EXACT, LOWER_BOUND or UPPER_BOUND
+            best_move: Best move found, if any
+        """
+        index = position_hash & self.tt_mask
+        if self.tt_age[index] == self.age and depth < self.tt_depth[index]:
+            return  # Keep the deeper result of this search
+        if score >= WIN_THRESHOLD:
+            score -= depth
+        elif score <= -WIN_THRESHOLD:
+            score += depth
+        self.tt_age[index] = self.age
+        self.tt_key[index] = position_hash
+        self.tt_score[index] = score
+        self.tt_depth[index] = depth
+        self.tt_bound[index] = bound
+        self.tt_move[index] = best_move
+
+
+# Transposition table slots of the throwaway context a worker searches one
+# root move with; the null-window subtree needs few, and a larger table would
+# cost more to allocate than the search of a shallow move
+WORKER_TT_SIZE = 1 << 10
+
+
+def _search_root_move_in_worker(bot: 'Bot', game: Connect4, move: int,
+                                depth: int, alpha: int) -> int:
+    """
+    Null-window search of one root move, run on a Bot's executor.
+    
+    Args:
+        bot: Bot doing the search
+        game: Copy of the root position
+        move: Column to play
+        depth: Search depth, including the root move
+        alpha: Score the move has to beat
+        
+    Returns:
+        Score of the move; above alpha if and only if the move beats it
+    """
+    context = SearchContext(tt_size=WORKER_TT_SIZE)
+    return bot._search_root_move(context, game, move, depth, alpha, alpha + 1,
+                                 game.hash, game.mirror_hash)
 
 
 class Bot:
     """
     Optimal Connect 4 bot that uses minimax with alpha-beta pruning.
+    
+    A Bot is not changed by searching; per-search state lives in a
+    SearchContext, so one Bot can be shared between threads.
     """
     
     def __init__(self, depth: int = 6, player: Player = Player.YELLOW, 
-                 search_type: str = "iterative"):
+                 search_type: str = "iterative", executor: Optional[Executor] = None):
         """
         Initialize the bot.
         
@@ -38,167 +340,120 @@ class Bot:
             depth: Maximum depth for minimax search (default: 6)
             player: Which player the bot represents (default: YELLOW)
             search_type: Type of search to use - "iterative" or "fixed" (default: "iterative")
+            executor: Pool to search root moves in parallel on, e.g. a
+                ProcessPoolExecutor (default: search serially)
         """
         self.depth = depth
         self.player = player
         self.opponent = Player.RED if player == Player.YELLOW else Player.YELLOW
         self.search_type = search_type
+        self.executor = executor
         
         if search_type not in ["iterative", "fixed"]:
             raise ValueError("search_type must be 'iterative' or 'fixed'")
-        
-        # Initialize Zobrist hashing table
-        self.zobrist_table = self._init_zobrist_table()
-        
-        # Initialize transposition table
-        self.transposition_table: Dict[int, TranspositionEntry] = {}
-        
-        # Player hash key (to distinguish positions with same board but different current player)
-        self.player_key = random.getrandbits(64)
-        
-        # Cache for valid moves (keyed by position hash)
-        self.valid_moves_cache: Dict[int, list] = {}
-        
-        # Cache for evaluation scores (keyed by position hash)
-        self.evaluation_cache: Dict[int, float] = {}
     
-    def _init_zobrist_table(self) -> list:
-        """
-        Initialize Zobrist hash table with random 64-bit integers.
-        
-        Returns:
-            3D list: zobrist_table[row][col][player_index]
-        """
-        table = []
-        for row in range(Connect4.ROWS):
-            table_row = []
-            for col in range(Connect4.COLS):
-                # 3 players: NONE (0), RED (1), YELLOW (2)
-                table_row.append([
-                    random.getrandbits(64),
-                    random.getrandbits(64),
-                    random.getrandbits(64)
-                ])
-            table.append(table_row)
-        return table
+    def __getstate__(self) -> dict:
+        """Pickle the bot for a worker process, leaving out its executor."""
+        state = self.__dict__.copy()
+        state['executor'] = None
+        return state
     
-    def _compute_hash(self, game: Connect4) -> int:
+    def _compute_hash(self, game: Connect4, mirrored: bool = False) -> int:
         """
-        Compute Zobrist hash for the current board position.
+        Compute Zobrist hash for the current board position from scratch.
+        
+        The game keeps this hash up to date as it is played (game.hash and
+        game.mirror_hash), so searches do not need to call this.
         
         Args:
             game: Current game state
+            mirrored: Hash the position mirrored left to right instead
             
         Returns:
             64-bit hash value
         """
         hash_value = 0
         
-        # XOR all pieces on the board
+        # XOR all pieces on the board; empty cells have no key
         for row in range(Connect4.ROWS):
             for col in range(Connect4.COLS):
-                player = game.board[row][col]
-                player_index = player.value
-                hash_value ^= self.zobrist_table[row][col][player_index]
+                # Player is an IntEnum, so it indexes the table directly
+                player_index = game.get_cell(row, col)
+                if player_index == NONE:
+                    continue
+                key_col = Connect4.COLS - 1 - col if mirrored else col
+                hash_value ^= ZOBRIST[row][key_col][player_index]
         
         # Include current player in hash
-        current_player_index = game.current_player.value
-        hash_value ^= (self.player_key * current_player_index)
-        
-        return hash_value
-    
-    def _update_hash(self, hash_value: int, row: int, col: int, 
-                    old_player: Player, new_player: Player) -> int:
-        """
-        Incrementally update hash when a piece is placed or removed.
-        
-        Args:
-            hash_value: Current hash value
-            row: Row of the changed cell
-            col: Column of the changed cell
-            old_player: Previous player at this position
-            new_player: New player at this position
-            
-        Returns:
-            Updated hash value
-        """
-        # Remove old piece
-        hash_value ^= self.zobrist_table[row][col][old_player.value]
-        # Add new piece
-        hash_value ^= self.zobrist_table[row][col][new_player.value]
-        return hash_value
-    
-    def _update_hash_for_move(self, hash_value: int, row: int, col: int, 
-                              old_player: Player, new_player: Player, 
-                              old_current_player: Player, new_current_player: Player) -> int:
-        """
-        Update hash for a move (piece placement + player change).
+        current_player_index = game.current_player
+        hash_value ^= SIDE_KEY[current_player_index]
         
-        Args:
-            hash_value: Current hash value
-            row: Row of the changed cell
-            col: Column of the changed cell
-            old_player: Previous player at this position (should be NONE)
-            new_player: New player at this position
-            old_current_player: Previous current player
-            new_current_player: New current player
-            
-        Returns:
-            Updated hash value
-        """
-        # Update piece
-        hash_value = self._update_hash(hash_value, row, col, old_player, new_player)
-        # Update current player
-        hash_value ^= (self.player_key * old_current_player.value)
-        hash_value ^= (self.player_key * new_current_player.value)
         return hash_value
     
-    def _order_moves(self, game: Connect4, valid_moves: list, 
-                    position_hash: int) -> list:
+    def _order_moves(self, context: SearchContext, heights: list, position_hash: int,
+                    depth: Optional[int] = None, mirrored: bool = False) -> list:
         """
         Order moves to maximize alpha-beta pruning efficiency.
         
         Args:
-            game: Current game state
-            valid_moves: List of valid column moves
-            position_hash: Hash of current position (for transposition table lookup)
+            context: Search state holding the transposition table and killers
+            heights: Number of pieces in each column
+            position_hash: Transposition table key of the current position
+            depth: Remaining search depth (for killer move lookup)
+            mirrored: The key is the hash of the mirrored position, so the
+                stored best move is mirrored too
             
         Returns:
-            Ordered list of moves (best moves first)
+            Ordered list of valid moves (best moves first)
         """
-        # Check transposition table for best move
-        best_move = None
-        if position_hash in self.transposition_table:
-            entry = self.transposition_table[position_hash]
-            if entry.best_move is not None and entry.best_move in valid_moves:
-                best_move = entry.best_move
-        
-        # Center columns are more valuable (order: 3, 2, 4, 1, 5, 0, 6)
-        center_order = [3, 2, 4, 1, 5, 0, 6]
-        
-        # Separate moves into ordered groups
+        rows = Connect4.ROWS
         ordered_moves = []
         
         # First: best move from transposition table (if available)
-        if best_move is not None:
-            ordered_moves.append(best_move)
-        
-        # Then: order remaining moves by center preference
-        remaining_moves = [m for m in valid_moves if m != best_move]
-        
-        # Sort remaining moves by center order
-        remaining_moves.sort(key=lambda m: center_order.index(m) if m in center_order else 999)
+        index = position_hash & context.tt_mask
+        tt_move = context.tt_move[index]
+        if tt_move is not None and context.tt_key[index] == position_hash:
+            if mirrored:
+                tt_move = Connect4.COLS - 1 - tt_move
+            if heights[tt_move] < rows:
+                ordered_moves.append(tt_move)
+        else:
+            tt_move = None
         
-        ordered_moves.extend(remaining_moves)
+        # Then: the two killer moves that last caused a cutoff at this depth
+        if depth is not None:
+            killer, second_killer = context.killers[depth]
+        else:
+            killer = second_killer = None
+        if killer is not None and killer != tt_move and heights[killer] < rows:
+            ordered_moves.append(killer)
+        if (second_killer is not None and second_killer != tt_move
+                and heights[second_killer] < rows):
+            ordered_moves.append(second_killer)
+        
+        # Then: remaining moves by center preference; above the horizon,
+        # moves that caused more cutoffs go first. Just above the horizon the
+        # children are cheap static evaluations and sorting costs more than
+        # it saves.
+        remaining = [col for col in CENTER_ORDER
+                     if heights[col] < rows and col != tt_move
+                     and col != killer and col != second_killer]
+        if depth is not None and depth >= 2:
+            remaining.sort(key=context.history.__getitem__, reverse=True)
+        ordered_moves.extend(remaining)
         
         return ordered_moves
     
-    def get_best_move(self, game: Connect4) -> Optional[int]:
+    def get_best_move(self, game: Connect4,
+                      context: Optional[SearchContext] = None) -> Optional[int]:
         """
         Get the best move for the bot using either iterative deepening or fixed depth.
         
         Args:
             game: Current Connect4 game instance
+            context: Search state to use, e.g. one kept per game so the
+                transposition table carries over between moves (default: a
+                fresh context)
             
         Returns:
             Column index of the best move, or None if no valid moves
@@ -206,361 +461,494 @@ class Bot:
         if game.game_over:
             return None
         
-        valid_moves = game.get_valid_moves()
-        if not valid_moves:
+        if not game.valid_mask():
             return None
         
-        # Clear transposition table and caches for new search
-        self.transposition_table.clear()
-        self.valid_moves_cache.clear()
-        self.evaluation_cache.clear()
+        if context is None:
+            context = SearchContext()
         
-        if self.search_type == "iterative":
-            return self._get_best_move_iterative(game, valid_moves)
-        else:
-            return self._get_best_move_fixed(game, valid_moves)
+        # The transposition table and history are kept across searches with
+        # the same context, the table's older entries giving way to this
+        # search's. The per-search caches are cleared before the search and
+        # again after it, so a context kept between moves stays small.
+        context.age += 1
+        context.clear_search_caches()
+        
+        # No search goes deeper than the empty cells, which also keeps the
+        # remaining depth within the context's killer slots
+        depth = min(self.depth, Connect4.ROWS * Connect4.COLS - len(game.move_history))
+        
+        try:
+            if self.search_type == "iterative":
+                return self._get_best_move_iterative(context, game, depth)
+            else:
+                return self._get_best_move_fixed(context, game, depth)
+        finally:
+            context.clear_search_caches()
     
-    def _get_best_move_iterative(self, game: Connect4, valid_moves: list) -> Optional[int]:
+    def _get_best_move_iterative(self, context: SearchContext, game: Connect4,
+                                 depth: int) -> Optional[int]:
         """
         Get best move using iterative deepening.
         
+        Each iteration searches the previous iteration's best move first, and
+        the transposition table filled by shallower iterations orders and
+        prunes the deeper ones. No new iteration is started once the
+        context's deadline has passed.
+        
         Args:
+            context: Search state
             game: Current Connect4 game instance
-            valid_moves: List of valid column moves
-            
+            depth: Depth of the last iteration
         Returns:
             Column index of the best move, or None if no valid moves
         """
         best_move = None
-        position_hash = self._compute_hash(game)
+        best_value = None
+        position_hash = game.hash
+        mirror_hash = game.mirror_hash
+        ordered_moves = self._root_moves(context, game, position_hash, mirror_hash)
         
         # Iterative deepening: search from depth 1 to max depth
-        for current_depth in range(1, self.depth + 1):
-            best_value = float('-inf')
-            current_best_move = None
+        for current_depth in range(1, depth + 1):
+            if (best_move is not None and context.deadline is not None
+                    and time.perf_counter() >= context.deadline):
+                break
             
-            # Get ordered moves for this iteration (with symmetry)
-            ordered_moves = self._order_moves(game, valid_moves, position_hash)
-            
-            for move in ordered_moves:
-                # Check for immediate win
-                row = game.get_next_open_row(move)
-                if row is not None:
-                    # Make the move
-                    game.make_move(move)
-                    
-                    # Early win detection
-                    if game.game_over and game.winner == self.player:
-                        game.undo_move()
-                        return move  # Immediate win found
-                    
-                    # Evaluate the position
-                    new_hash = self._update_hash_for_move(
-                        position_hash, row, move, 
-                        Player.NONE, self.player,
-                        self.player, self.opponent
-                    )
-                    value = self._minimax_with_hash(game, current_depth - 1, False, 
-                                                   float('-inf'), float('inf'), new_hash)
-                    
-                    # Undo the move
-                    game.undo_move()
-                    
-                    if value > best_value:
-                        best_value = value
-                        current_best_move = move
+            # Aspiration window: expect a score close to the previous
+            # iteration's, and only search the full window if it is not
+            if best_value is None:
+                alpha, beta = -INF, INF
+            else:
+                alpha = best_value - ASPIRATION_WINDOW
+                beta = best_value + ASPIRATION_WINDOW
+            current_best_move, best_value = self._search_root(
+                context, game, ordered_moves, current_depth, position_hash, mirror_hash,
+                alpha, beta
+            )
+            if best_value <= alpha or best_value >= beta:
+                current_best_move, best_value = self._search_root(
+                    context, game, ordered_moves, current_depth, position_hash, mirror_hash
+                )
             
             # Update best move for this depth
             if current_best_move is not None:
                 best_move = current_best_move
+                # Search it first at the next depth
+                ordered_moves.remove(best_move)
+                ordered_moves.insert(0, best_move)
         
         return best_move
     
-    def _get_best_move_fixed(self, game: Connect4, valid_moves: list) -> Optional[int]:
+    def _get_best_move_fixed(self, context: SearchContext, game: Connect4,
+                             depth: int) -> Optional[int]:
         """
         Get best move using fixed depth search.
         
         Args:
+            context: Search state
             game: Current Connect4 game instance
-            valid_moves: List of valid column moves
-            
+            depth: Search depth
         Returns:
             Column index of the best move, or None if no valid moves
         """
-        best_move = None
-        best_value = float('-inf')
-        position_hash = self._compute_hash(game)
+        position_hash = game.hash
+        mirror_hash = game.mirror_hash
         
         # Get ordered moves (with symmetry)
-        ordered_moves = self._order_moves(game, valid_moves, position_hash)
+        ordered_moves = self._root_moves(context, game, position_hash, mirror_hash)
+        
+        best_move, _ = self._search_root(context, game, ordered_moves, depth,
+                                         position_hash, mirror_hash)
+        return best_move
+    
+    def _root_moves(self, context: SearchContext, game: Connect4,
+                    position_hash: int, mirror_hash: int) -> list:
+        """
+        Order the root moves, dropping mirrored duplicates.
+        
+        When the position is symmetric, each column right of center leads to
+        the mirror image of a column left of it and scores the same, so only
+        the center and left half are searched.
+        
+        Args:
+            context: Search state
+            game: Current Connect4 game instance
+            position_hash: Hash of the root position
+            mirror_hash: Hash of the mirrored root position
+            
+        Returns:
+            Ordered list of root moves to search
+        """
+        mirrored = mirror_hash < position_hash
+        ordered_moves = self._order_moves(
+            context, game.heights, mirror_hash if mirrored else position_hash, mirrored=mirrored
+        )
+        if game.is_symmetric():
+            ordered_moves = [move for move in ordered_moves
+                             if move <= Connect4.COLS // 2]
+        return ordered_moves
+    
+    def _search_root(self, context: SearchContext, game: Connect4,
+                     ordered_moves: list, depth: int,
+                     position_hash: int,
+                     mirror_hash: Optional[int] = None,
+                     alpha: int = -INF, beta: int = INF) -> Tuple[Optional[int], int]:
+        """
+        Search every root move to the given depth.
+        
+        Args:
+            context: Search state
+            game: Current Connect4 game instance
+            ordered_moves: Root moves in the order to search them
+            depth: Search depth, including the root move
+            position_hash: Hash of the root position
+            mirror_hash: Hash of the mirrored root position (default: game.mirror_hash)
+            alpha: Lower bound of the score window (default: none)
+            beta: Upper bound of the score window (default: none)
+            
+        Returns:
+            Tuple of (best move, its score for the side to move). A score at
+            or below alpha is only an upper bound on the true score, and one
+            at or above beta only a lower bound.
+        """
+        if mirror_hash is None:
+            mirror_hash = game.mirror_hash
+        
+        if self.executor is not None and depth > 1 and len(ordered_moves) > 1:
+            return self._search_root_parallel(context, game, ordered_moves, depth,
+                                              position_hash, mirror_hash, alpha, beta)
+        
+        context.nodes += 1
+        best_move = None
+        best_value = -INF
         
         for move in ordered_moves:
-            # Check for immediate win
-            row = game.get_next_open_row(move)
-            if row is not None:
-                # Make the move
-                game.make_move(move)
-                
-                # Early win detection
-                if game.game_over and game.winner == self.player:
-                    game.undo_move()
-                    return move  # Immediate win found
-                
-                # Evaluate the position at fixed depth
-                new_hash = self._update_hash_for_move(
-                    position_hash, row, move,
-                    Player.NONE, self.player,
-                    self.player, self.opponent
-                )
-                value = self._minimax_with_hash(game, self.depth - 1, False, 
-                                               float('-inf'), float('inf'), new_hash)
-                
-                # Undo the move
-                game.undo_move()
-                
+            # Moves that cannot beat the best score so far only need to be
+            # proven no better
+            value = self._search_root_move(context, game, move, depth,
+                                           max(best_value, alpha), beta,
+                                           position_hash, mirror_hash)
+            
+            # Immediate win: nothing can score better
+            if value == WIN_SCORE + depth:
+                return move, value
+            
+            if value > best_value:
+                best_value = value
+                best_move = move
+            
+            if best_value >= beta:
+                break  # Above the window
+        
+        return best_move, best_value
+    
+    def _search_root_parallel(self, context: SearchContext, game: Connect4,
+                              ordered_moves: list, depth: int, position_hash: int,
+                              mirror_hash: int, alpha: int,
+                              beta: int) -> Tuple[Optional[int], int]:
+        """
+        Search the root moves on the bot's executor.
+        
+        The first move is searched here to set the score to beat. Every other
+        move then gets a null-window search in a worker, with a fresh small
+        search context; only moves whose search fails high are searched again here
+        to find their exact score.
+        
+        Args:
+            context: Search state
+            game: Current Connect4 game instance
+            ordered_moves: Root moves in the order to search them
+            depth: Search depth, including the root move
+            position_hash: Hash of the root position
+            mirror_hash: Hash of the mirrored root position
+            alpha: Lower bound of the score window
+            beta: Upper bound of the score window
+            
+        Returns:
+            Tuple of (best move, its score for the side to move), with
+            scores outside the window being bounds as for _search_root
+        """
+        context.nodes += 1
+        best_move = ordered_moves[0]
+        best_value = self._search_root_move(context, game, best_move, depth, alpha, beta,
+                                            position_hash, mirror_hash)
+        if best_value == WIN_SCORE + depth or best_value >= beta:
+            return best_move, best_value
+        
+        alpha = max(alpha, best_value)
+        futures = [
+            (move, self.executor.submit(_search_root_move_in_worker, self, game.copy(),
+                                        move, depth, alpha))
+            for move in ordered_moves[1:]
+        ]
+        for move, future in futures:
+            # A null-window result only tells whether the move beats alpha
+            if future.result() > alpha and best_value < beta:
+                value = self._search_root_move(context, game, move, depth,
+                                               max(best_value, alpha), beta,
+                                               position_hash, mirror_hash)
                 if value > best_value:
                     best_value = value
                     best_move = move
         
-        return best_move
+        return best_move, best_value
     
-    def _minimax(self, game: Connect4, depth: int, maximizing: bool, 
-                 alpha: float, beta: float) -> float:
+    def _search_root_move(self, context: SearchContext, game: Connect4, move: int,
+                          depth: int, alpha: int, beta: int, position_hash: int,
+                          mirror_hash: int) -> int:
         """
-        Minimax algorithm wrapper that computes hash and calls internal version.
+        Score one root move.
         
         Args:
-            game: Current game state
-            depth: Remaining search depth
-            maximizing: True if maximizing (bot's turn), False if minimizing
-            alpha: Best value for maximizing player
-            beta: Best value for minimizing player
+            context: Search state
+            game: Current Connect4 game instance
+            move: Column to play
+            depth: Search depth, including the root move
+            alpha: Lower bound of the score window
+            beta: Upper bound of the score window
+            position_hash: Hash of the root position
+            mirror_hash: Hash of the mirrored root position
             
         Returns:
-            Evaluation score of the position
+            Score of the move for the side to move; WIN_SCORE + depth if the
+            move wins outright
         """
-        position_hash = self._compute_hash(game)
-        return self._minimax_with_hash(game, depth, maximizing, alpha, beta, position_hash)
+        mover = game.current_player
+        opponent = YELLOW if mover == RED else RED
+        heights = game.heights[:]
+        mover_bb = game.bb[mover - 1] | 1 << (move * Connect4.H1 + heights[move])
+        other_bb = game.bb[2 - mover]
+        moves = len(game.move_history) + 1
+        
+        if check_win(mover_bb):
+            return WIN_SCORE + depth
+        if moves == Connect4.ROWS * Connect4.COLS:
+            return 0  # Draw
+        if depth == 1:
+            return -self._evaluate_leaf(context, other_bb, mover_bb)
+        
+        # Add the piece and pass the turn
+        row_keys = ZOBRIST[Connect4.ROWS - 1 - heights[move]]
+        side_keys = SIDE_KEY[mover] ^ SIDE_KEY[opponent]
+        new_hash = position_hash ^ row_keys[move][mover] ^ side_keys
+        new_mirror_hash = mirror_hash ^ row_keys[Connect4.COLS - 1 - move][mover] ^ side_keys
+        heights[move] += 1
+        return -self._negamax_with_hash(context, opponent, other_bb, mover_bb, heights,
+                                        moves, depth - 1, -beta, -alpha,
+                                        new_hash, new_mirror_hash)
     
-    def _minimax_with_hash(self, game: Connect4, depth: int, maximizing: bool, 
-                          alpha: float, beta: float, position_hash: int) -> float:
+    def _negamax(self, game: Connect4, depth: int, alpha: int, beta: int,
+                 context: Optional[SearchContext] = None) -> int:
         """
-        Minimax algorithm with alpha-beta pruning, transposition tables, move ordering,
-        Principal Variation Search, and incremental hashing.
+        Negamax wrapper that computes the hashes and calls the internal version.
         
         Args:
             game: Current game state
             depth: Remaining search depth
-            maximizing: True if maximizing (bot's turn), False if minimizing
-            alpha: Best value for maximizing player
-            beta: Best value for minimizing player
-            position_hash: Pre-computed hash for this position
+            alpha: Lower bound of the score window
+            beta: Upper bound of the score window
+            context: Search state (default: a fresh context)
             
         Returns:
-            Evaluation score of the position
+            Evaluation score of the position for the side to move
         """
-        # Check transposition table
-        if position_hash in self.transposition_table:
-            entry = self.transposition_table[position_hash]
-            if entry.depth >= depth:
-                if entry.bound == BoundType.EXACT:
-                    return entry.score
-                elif entry.bound == BoundType.LOWER_BOUND:
-                    if entry.score >= beta:
-                        return entry.score
-                    alpha = max(alpha, entry.score)
-                elif entry.bound == BoundType.UPPER_BOUND:
-                    if entry.score <= alpha:
-                        return entry.score
-                    beta = min(beta, entry.score)
-        
-        # Terminal conditions
         if game.game_over:
-            if game.winner == self.player:
-                score = 1000 + depth  # Prefer faster wins
-            elif game.winner == self.opponent:
-                score = -1000 - depth  # Prefer slower losses
-            else:
-                score = 0  # Draw
-            
-            # Store in transposition table
-            self.transposition_table[position_hash] = TranspositionEntry(
-                score, depth, BoundType.EXACT
-            )
-            return score
-        
+            # Only the player who just moved can have won
+            return -(WIN_SCORE + depth) if game.winner != NONE else 0
+        
+        if context is None:
+            context = SearchContext()
+        mover = game.current_player
+        mover_bb = game.bb[mover - 1]
+        other_bb = game.bb[2 - mover]
         if depth == 0:
-            # Check evaluation cache
-            if position_hash in self.evaluation_cache:
-                score = self.evaluation_cache[position_hash]
-            else:
-                score = self._evaluate_position(game)
-                self.evaluation_cache[position_hash] = score
-            
-            # Store in transposition table
-            self.transposition_table[position_hash] = TranspositionEntry(
-                score, depth, BoundType.EXACT
-            )
-            return score
+            return self._evaluate_leaf(context, mover_bb, other_bb)
+        position_hash = game.hash
+        mirror_hash = game.mirror_hash
+        return self._negamax_with_hash(context, mover, mover_bb, other_bb,
+                                       game.heights[:], len(game.move_history),
+                                       depth, alpha, beta, position_hash, mirror_hash)
+    
+    def _negamax_with_hash(self, context: SearchContext, mover: int, mover_bb: int,
+                           other_bb: int, heights: list, moves: int,
+                           depth: int, alpha: int, beta: int,
+                           position_hash: int, mirror_hash: int) -> int:
+        """
+        Negamax search with alpha-beta pruning, transposition tables, move
+        ordering, Principal Variation Search, and incremental hashing.
         
-        # Get cached or compute valid moves
-        if position_hash in self.valid_moves_cache:
-            valid_moves = self.valid_moves_cache[position_hash]
-        else:
-            valid_moves = game.get_valid_moves()
-            self.valid_moves_cache[position_hash] = valid_moves
+        The search works on the position's raw bitboards and column heights
+        rather than a Connect4 object: a move is one OR on the mover's
+        bitboard and one increment of its column height, undone by passing
+        the old bitboard back up and decrementing the height.
         
-        ordered_moves = self._order_moves(game, valid_moves, position_hash)
+        Scores are from the point of view of the side to move, so a child's
+        score is negated and its window flipped. Wins and draws are detected
+        right after each move, before any recursive call.
         
-        if not ordered_moves:
-            # No moves available (shouldn't happen if depth > 0 and not game_over)
-            score = 0
-            self.transposition_table[position_hash] = TranspositionEntry(
-                score, depth, BoundType.EXACT
-            )
-            return score
+        A position and its mirror image share one transposition table entry,
+        keyed by the smaller of their two hashes; best moves are stored in the
+        orientation of that key.
+        
+        Args:
+            context: Search state
+            mover: Player to move (RED or YELLOW)
+            mover_bb: Bitboard of the side to move
+            other_bb: Bitboard of the other side
+            heights: Pieces in each column; changed during the search and
+                restored before returning
+            moves: Number of pieces on the board
+            depth: Remaining search depth, at least 1, in a position that is
+                not over
+            alpha: Lower bound of the score window
+            beta: Upper bound of the score window
+            position_hash: Pre-computed hash for this position
+            mirror_hash: Pre-computed hash for the mirrored position
+            
+        Returns:
+            Evaluation score of the position for the side to move
+        """
+        context.nodes += 1
+        mirrored = mirror_hash < position_hash
+        key = mirror_hash if mirrored else position_hash
+        
+        # Check transposition table
+        index = key & context.tt_mask
+        if context.tt_key[index] == key and context.tt_depth[index] >= depth:
+            tt_score = context.tt_score[index]
+            # Win scores are stored relative to the position (see store_entry)
+            if tt_score >= WIN_THRESHOLD:
+                tt_score += depth
+            elif tt_score <= -WIN_THRESHOLD:
+                tt_score -= depth
+            tt_bound = context.tt_bound[index]
+            if tt_bound == EXACT:
+                return tt_score
+            elif tt_bound == LOWER_BOUND:
+                if tt_score >= beta:
+                    return tt_score
+                alpha = max(alpha, tt_score)
+            else:
+                if tt_score <= alpha:
+                    return tt_score
+                beta = min(beta, tt_score)
+            if alpha >= beta:
+                return tt_score
+        
+        opponent = YELLOW if mover == RED else RED
+        side_keys = SIDE_KEY[mover] ^ SIDE_KEY[opponent]
+        draw = moves + 1 == Connect4.ROWS * Connect4.COLS
         
         best_move = None
         original_alpha = alpha
-        
-        if maximizing:
-            # Principal Variation Search: first move uses full window, others use null window
-            first_move = True
-            
-            for move in ordered_moves:
-                row = game.get_next_open_row(move)
-                if row is None:
-                    continue
-                
-                # Early win detection
-                game.make_move(move)
-                if game.game_over and game.winner == self.player:
-                    game.undo_move()
-                    score = 1000 + depth
-                    self.transposition_table[position_hash] = TranspositionEntry(
-                        score, depth, BoundType.EXACT, move
-                    )
-                    return score
-                
-                # Update hash incrementally
-                new_hash = self._update_hash_for_move(
-                    position_hash, row, move,
-                    Player.NONE, self.player,
-                    self.player, self.opponent
-                )
+        # Principal Variation Search: first move uses full window, others use null window
+        first_move = True
+        
+        for move in self._order_moves(context, heights, key, depth, mirrored):
+            height = heights[move]
+            child_bb = mover_bb | 1 << (move * Connect4.H1 + height)
+            won = check_win(child_bb)
+            if won:
+                score = WIN_SCORE + depth
+            elif draw:
+                score = 0
+            elif depth == 1:
+                # Horizon child: score it straight from the bitboards, without
+                # hashing it
+                score = -self._evaluate_leaf(context, other_bb, child_bb)
+            else:
+                # Add the piece and pass the turn
+                row_keys = ZOBRIST[Connect4.ROWS - 1 - height]
+                new_hash = position_hash ^ row_keys[move][mover] ^ side_keys
+                new_mirror_hash = (mirror_hash ^ row_keys[Connect4.COLS - 1 - move][mover]
+                                   ^ side_keys)
                 
+                heights[move] = height + 1
                 if first_move:
                     # Full window search for first move
-                    eval_score = self._minimax_with_hash(
-                        game, depth - 1, False, alpha, beta, new_hash
+                    score = -self._negamax_with_hash(
+                        context, opponent, other_bb, child_bb, heights, moves + 1,
+                        depth - 1, -beta, -alpha, new_hash, new_mirror_hash
                     )
-                    first_move = False
                 else:
                     # Null window search (Principal Variation Search)
-                    eval_score = self._minimax_with_hash(
-                        game, depth - 1, False, alpha, alpha + 1, new_hash
+                    score = -self._negamax_with_hash(
+                        context, opponent, other_bb, child_bb, heights, moves + 1,
+                        depth - 1, -alpha - 1, -alpha, new_hash, new_mirror_hash
                     )
                     
                     # If null window search fails high, do full search
-                    if eval_score > alpha and eval_score < beta:
-                        eval_score = self._minimax_with_hash(
-                            game, depth - 1, False, alpha, beta, new_hash
+                    if alpha < score < beta:
+                        score = -self._negamax_with_hash(
+                            context, opponent, other_bb, child_bb, heights, moves + 1,
+                            depth - 1, -beta, -alpha, new_hash, new_mirror_hash
                         )
-                
-                game.undo_move()
-                
-                if eval_score > alpha:
-                    alpha = eval_score
-                    best_move = move
-                
-                if beta <= alpha:
-                    break  # Alpha-beta pruning
+                heights[move] = height
             
-            max_eval = alpha
+            # Early win detection: no other move can score better
+            if won:
+                context.store_entry(key, score, depth, EXACT,
+                                    Connect4.COLS - 1 - move if mirrored else move)
+                return score
             
-            # Store in transposition table
-            if max_eval <= original_alpha:
-                bound = BoundType.UPPER_BOUND
-            elif max_eval >= beta:
-                bound = BoundType.LOWER_BOUND
-            else:
-                bound = BoundType.EXACT
+            first_move = False
             
-            self.transposition_table[position_hash] = TranspositionEntry(
-                max_eval, depth, bound, best_move
-            )
+            if score > alpha:
+                alpha = score
+                best_move = move
             
-            return max_eval
+            if alpha >= beta:
+                context.record_cutoff(depth, move)
+                break  # Alpha-beta pruning
+        
+        # Store in transposition table
+        if alpha <= original_alpha:
+            bound = UPPER_BOUND
+        elif alpha >= beta:
+            bound = LOWER_BOUND
         else:
-            # Minimizing player
-            first_move = True
-            
-            for move in ordered_moves:
-                row = game.get_next_open_row(move)
-                if row is None:
-                    continue
-                
-                # Early loss detection
-                game.make_move(move)
-                if game.game_over and game.winner == self.opponent:
-                    game.undo_move()
-                    score = -1000 - depth
-                    self.transposition_table[position_hash] = TranspositionEntry(
-                        score, depth, BoundType.EXACT, move
-                    )
-                    return score
-                
-                # Update hash incrementally
-                new_hash = self._update_hash_for_move(
-                    position_hash, row, move,
-                    Player.NONE, self.opponent,
-                    self.opponent, self.player
-                )
-                
-                if first_move:
-                    # Full window search for first move
-                    eval_score = self._minimax_with_hash(
-                        game, depth - 1, True, alpha, beta, new_hash
-                    )
-                    first_move = False
-                else:
-                    # Null window search (Principal Variation Search)
-                    eval_score = self._minimax_with_hash(
-                        game, depth - 1, True, beta - 1, beta, new_hash
-                    )
-                    
-                    # If null window search fails low, do full search
-                    if eval_score < beta and eval_score > alpha:
-                        eval_score = self._minimax_with_hash(
-                            game, depth - 1, True, alpha, beta, new_hash
-                        )
-                
-                game.undo_move()
-                
-                if eval_score < beta:
-                    beta = eval_score
-                    best_move = move
-                
-                if beta <= alpha:
-                    break  # Alpha-beta pruning
-            
-            min_eval = beta
-            
-            # Store in transposition table
-            if min_eval <= original_alpha:
-                bound = BoundType.UPPER_BOUND
-            elif min_eval >= beta:
-                bound = BoundType.LOWER_BOUND
-            else:
-                bound = BoundType.EXACT
-            
-            self.transposition_table[position_hash] = TranspositionEntry(
-                min_eval, depth, bound, best_move
-            )
+            bound = EXACT
+        
+        if mirrored and best_move is not None:
+            best_move = Connect4.COLS - 1 - best_move
+        context.store_entry(key, alpha, depth, bound, best_move)
+        
+        return alpha
+    
+    def _evaluate_leaf(self, context: SearchContext, mover_bb: int,
+                       other_bb: int) -> int:
+        """
+        Score a position at the search horizon for the side to move.
+        
+        Horizon children are scored by their parent straight from the
+        bitboards, without making the move, hashing it, a recursive call, a
+        transposition table probe or a PVS re-search, since the static
+        evaluation is exact whatever the search window.
+        
+        Args:
+            context: Search state
+            mover_bb: Bitboard of the side to move, in a position that is not over
+            other_bb: Bitboard of the other side
             
-            return min_eval
+        Returns:
+            Evaluation score of the position for the side to move
+        """
+        context.nodes += 1
+        # Bitboards fit in BOARD_BITS bits, so the pair identifies the position
+        key = mover_bb << BOARD_BITS | other_bb
+        score = context.evaluation_cache.get(key)
+        if score is None:
+            score = context.evaluation_cache[key] = evaluate_position(mover_bb, other_bb)
+        return score
     
-    def _evaluate_position(self, game: Connect4) -> float:
+    def _bitboards(self, game: Connect4) -> Tuple[int, int]:
+        """Get the (bot, opponent) bitboards of a game."""
+        if self.player == RED:
+            return game.bb[0], game.bb[1]
+        return game.bb[1], game.bb[0]
+    
+    def _evaluate_position(self, game: Connect4) -> int:
         """
         Evaluate a position without terminal conditions.
         Heuristic: count potential winning lines for each player.
@@ -571,28 +959,10 @@ class Bot:
         Returns:
             Evaluation score (positive favors bot, negative favors opponent)
         """
-        score = 0
-        
-        # Evaluate all possible 4-in-a-row lines
-        for row in range(game.ROWS):
-            for col in range(game.COLS):
-                # Check horizontal
-                if col <= game.COLS - game.WIN_LENGTH:
-                    score += self._evaluate_line(game, row, col, 0, 1)
-                # Check vertical
-                if row <= game.ROWS - game.WIN_LENGTH:
-                    score += self._evaluate_line(game, row, col, 1, 0)
-                # Check diagonal /
-                if row <= game.ROWS - game.WIN_LENGTH and col <= game.COLS - game.WIN_LENGTH:
-                    score += self._evaluate_line(game, row, col, 1, 1)
-                # Check diagonal \
-                if row <= game.ROWS - game.WIN_LENGTH and col >= game.WIN_LENGTH - 1:
-                    score += self._evaluate_line(game, row, col, 1, -1)
-        
-        return score
+        return evaluate_position(*self._bitboards(game))
     
     def _evaluate_line(self, game: Connect4, row: int, col: int, 
-                      dr: int, dc: int) -> float:
+                      dr: int, dc: int) -> int:
         """
         Evaluate a potential 4-in-a-row line.
         
@@ -606,30 +976,4 @@ class Bot:
         Returns:
             Score contribution from this line
         """
-        bot_count = 0
-        opponent_count = 0
-        empty_count = 0
-        
-        for i in range(game.WIN_LENGTH):
-            r = row + dr * i
-            c = col + dc * i
-            cell = game.board[r][c]
-            
-            if cell == self.player:
-                bot_count += 1
-            elif cell == self.opponent:
-                opponent_count += 1
-            else:
-                empty_count += 1
-        
-        # Score based on potential
-        if bot_count > 0 and opponent_count == 0:
-            # Bot has pieces here, score based on count
-            return 10 ** bot_count
-        elif opponent_count > 0 and bot_count == 0:
-            # Opponent has pieces here, negative score
-            return -(10 ** opponent_count)
-        else:
-            # Mixed or empty, neutral
-            return 0
-
+        return evaluate_line(*self._bitboards(game), row, col, dr, dc)
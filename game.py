@@ -2,17 +2,24 @@
 Internal representation for Connect 4 game logic.
 """
 
-from enum import Enum
-from typing import Optional, List, Tuple
+import random
+from enum import IntEnum
+from typing import Iterable, Optional, List, Tuple
 
 
-class Player(Enum):
+class Player(IntEnum):
     """Represents the two players in the game."""
     RED = 1
     YELLOW = 2
     NONE = 0
 
 
+# Plain int values of Player, used on hot paths instead of enum members
+NONE = 0
+RED = 1
+YELLOW = 2
+
+
 class Connect4:
     """
     Internal representation of a Connect 4 game.
@@ -20,27 +27,74 @@ class Connect4:
     Standard Connect 4 board is 6 rows x 7 columns.
     Players take turns dropping pieces into columns.
     First to get 4 in a row (horizontal, vertical, or diagonal) wins.
+    
+    The board is stored as two bitboards, one per player. Each column
+    occupies H1 = ROWS + 1 consecutive bits (bottom row first), the extra
+    bit acting as a guard so that shifts never wrap between columns.
+    
+    The game also keeps the Zobrist hash of the position and of its mirror
+    image up to date as moves are made and undone (see ZOBRIST).
     """
     
     ROWS = 6
     COLS = 7
     WIN_LENGTH = 4
+    H1 = ROWS + 1
     
     def __init__(self):
         """Initialize an empty Connect 4 board."""
-        self.board = [[Player.NONE for _ in range(self.COLS)] 
-                      for _ in range(self.ROWS)]
-        self.current_player = Player.RED
+        self.bb = [0, 0]  # Indexed by player - 1
+        self.heights = [0] * self.COLS
+        self.current_player: int = RED
         self.game_over = False
-        self.winner = Player.NONE
+        self.winner: int = NONE
         self.move_history = []
+        self._board_cache: Optional[List[List[int]]] = None
+        self.hash = self.mirror_hash = EMPTY_HASH
+    
+    def _bit(self, row: int, col: int) -> int:
+        """Get the bitboard mask for a cell (row 0 is the top of the board)."""
+        return 1 << (col * self.H1 + self.ROWS - 1 - row)
+    
+    def get_cell(self, row: int, col: int) -> Player:
+        """
+        Get the player occupying a cell.
+        
+        Args:
+            row: Row index (0 is the top row)
+            col: Column index
+            
+        Returns:
+            The player whose piece is in the cell, or Player.NONE if empty
+        """
+        bit = self._bit(row, col)
+        if self.bb[0] & bit:
+            return Player.RED
+        if self.bb[1] & bit:
+            return Player.YELLOW
+        return Player.NONE
     
     def get_board(self) -> List[List[int]]:
         """
         Get the current board state as a 2D list of integers.
         Returns: 2D list where 0 = empty, 1 = RED, 2 = YELLOW
+        
+        The list is rebuilt from the bitboards only after the board has
+        changed, and is shared between calls, so callers must not modify it.
         """
-        return [[cell.value for cell in row] for row in self.board]
+        if self._board_cache is not None:
+            return self._board_cache
+        
+        board = [[NONE] * self.COLS for _ in range(self.ROWS)]
+        red = self.bb[0]
+        for col in range(self.COLS):
+            for height in range(self.heights[col]):
+                bit = 1 << (col * self.H1 + height)
+                board[self.ROWS - 1 - height][col] = (
+                    RED if red & bit else YELLOW
+                )
+        self._board_cache = board
+        return board
     
     def is_valid_move(self, col: int) -> bool:
         """
@@ -54,7 +108,7 @@ class Connect4:
         """
         if col < 0 or col >= self.COLS:
             return False
-        return self.board[0][col] == Player.NONE
+        return self.heights[col] < self.ROWS
     
     def get_next_open_row(self, col: int) -> Optional[int]:
         """
@@ -66,13 +120,12 @@ class Connect4:
         Returns:
             Row index if column has space, None otherwise
         """
-        if not self.is_valid_move(col):
+        if not 0 <= col < self.COLS:
             return None
-        
-        for row in range(self.ROWS - 1, -1, -1):
-            if self.board[row][col] == Player.NONE:
-                return row
-        return None
+        height = self.heights[col]
+        if height >= self.ROWS:
+            return None
+        return self.ROWS - 1 - height
     
     def make_move(self, col: int) -> bool:
         """
@@ -84,96 +137,121 @@ class Connect4:
         Returns:
             True if move was successful, False otherwise
         """
-        if self.game_over:
+        if self.game_over or not 0 <= col < self.COLS:
             return False
         
-        if not self.is_valid_move(col):
+        height = self.heights[col]
+        if height >= self.ROWS:
             return False
         
-        row = self.get_next_open_row(col)
-        if row is None:
-            return False
-        
-        self.board[row][col] = self.current_player
-        self.move_history.append((row, col, self.current_player))
+        player = self.current_player
+        self.bb[player - 1] ^= 1 << (col * self.H1 + height)
+        self.heights[col] = height + 1
+        self.move_history.append(col)
+        self._board_cache = None
         
         # Check for win
-        if self._check_win(row, col):
+        if self._check_win(player):
             self.game_over = True
-            self.winner = self.current_player
+            self.winner = player
         # Check for draw
         elif self._is_board_full():
             self.game_over = True
-            self.winner = Player.NONE
+            self.winner = NONE
         else:
             # Switch players
-            self.current_player = Player.YELLOW if self.current_player == Player.RED else Player.RED
+            self.current_player = YELLOW if player == RED else RED
         
+        self._update_hash(height, col, player,
+                          SIDE_KEY[player] ^ SIDE_KEY[self.current_player])
         return True
     
-    def _check_win(self, row: int, col: int) -> bool:
+    def make_moves(self, cols: Iterable[int]) -> bool:
         """
-        Check if the last move resulted in a win.
+        Make a sequence of moves, stopping at the first one that is rejected.
         
         Args:
-            row: Row of the last move
-            col: Column of the last move
+            cols: Column indices to play in order
             
         Returns:
-            True if this move wins the game
+            True if every move was successful, False otherwise
         """
-        player = self.board[row][col]
+        for col in cols:
+            if not self.make_move(col):
+                return False
+        return True
+    
+    def _update_hash(self, height: int, col: int, player: int, side_keys: int) -> None:
+        """
+        Toggle a piece in the position hashes and change the side to move.
         
-        # Check horizontal, vertical, and both diagonals
-        directions = [
-            (0, 1),   # horizontal
-            (1, 0),   # vertical
-            (1, 1),   # diagonal /
-            (1, -1)   # diagonal \
-        ]
+        The same call adds a piece when a move is made and removes it when
+        the move is undone.
         
-        for dr, dc in directions:
-            count = 1  # Count the current piece
-            
-            # Check positive direction
-            for i in range(1, self.WIN_LENGTH):
-                r, c = row + dr * i, col + dc * i
-                if (0 <= r < self.ROWS and 0 <= c < self.COLS and 
-                    self.board[r][c] == player):
-                    count += 1
-                else:
-                    break
-            
-            # Check negative direction
-            for i in range(1, self.WIN_LENGTH):
-                r, c = row - dr * i, col - dc * i
-                if (0 <= r < self.ROWS and 0 <= c < self.COLS and 
-                    self.board[r][c] == player):
-                    count += 1
-                else:
-                    break
-            
-            if count >= self.WIN_LENGTH:
-                return True
+        Args:
+            height: Height of the cell in its column (0 is the bottom)
+            col: Column of the cell
+            player: Player whose piece it is
+            side_keys: SIDE_KEY of the old side to move XOR that of the new one
+        """
+        keys = ZOBRIST[self.ROWS - 1 - height]
+        self.hash ^= keys[col][player] ^ side_keys
+        self.mirror_hash ^= keys[self.COLS - 1 - col][player] ^ side_keys
+    
+    def _check_win(self, player: int) -> bool:
+        """
+        Check if a player has four in a row anywhere on the board.
         
-        return False
+        Args:
+            player: Player whose pieces to check (RED or YELLOW)
+            
+        Returns:
+            True if the player has a winning line
+        """
+        return check_win(self.bb[player - 1])
     
     def _is_board_full(self) -> bool:
         """Check if the board is full (draw condition)."""
-        return all(self.board[0][col] != Player.NONE for col in range(self.COLS))
+        return (self.bb[0] | self.bb[1]).bit_count() == self.ROWS * self.COLS
+    
+    def valid_mask(self) -> int:
+        """
+        Get a bitboard of the cells where a piece would land next.
+        
+        Adding the bottom row to the occupied cells carries through each
+        column's stack into its first empty cell; a full column carries into
+        its guard bit, which BOARD_MASK clears.
+        
+        Returns:
+            Bitboard with one bit set per playable column (see COLUMN_MASKS)
+        """
+        return ((self.bb[0] | self.bb[1]) + BOTTOM_MASK) & BOARD_MASK
+    
+    def is_symmetric(self) -> bool:
+        """
+        Check whether the position reads the same mirrored left to right.
+        
+        Returns:
+            True if both players' pieces are symmetric about the center column
+        """
+        return (mirror_bitboard(self.bb[0]) == self.bb[0]
+                and mirror_bitboard(self.bb[1]) == self.bb[1])
     
     def get_valid_moves(self) -> List[int]:
         """Get a list of all valid column moves."""
-        return [col for col in range(self.COLS) if self.is_valid_move(col)]
+        return [col for col in range(self.COLS) if self.heights[col] < self.ROWS]
     
     def copy(self) -> 'Connect4':
         """Create a deep copy of the game state."""
         new_game = Connect4()
-        new_game.board = [row[:] for row in self.board]
+        new_game.bb = self.bb[:]
+        new_game.heights = self.heights[:]
         new_game.current_player = self.current_player
         new_game.game_over = self.game_over
         new_game.winner = self.winner
         new_game.move_history = self.move_history[:]
+        new_game.hash = self.hash
+        new_game.mirror_hash = self.mirror_hash
         return new_game
     
     def undo_move(self) -> bool:
@@ -186,13 +264,120 @@ class Connect4:
         if not self.move_history:
             return False
         
-        row, col, player = self.move_history.pop()
-        self.board[row][col] = Player.NONE
+        col = self.move_history.pop()
+        self._board_cache = None
+        self.heights[col] -= 1
+        # RED starts, so RED made every even-numbered move
+        player = RED if len(self.move_history) % 2 == 0 else YELLOW
+        self.bb[player - 1] ^= 1 << (col * self.H1 + self.heights[col])
+        self._update_hash(self.heights[col], col, player,
+                          SIDE_KEY[self.current_player] ^ SIDE_KEY[player])
         
         # Reset game state
         self.game_over = False
-        self.winner = Player.NONE
+        self.winner = NONE
         self.current_player = player
         
         return True
+    
+    def undo_moves(self, count: int) -> bool:
+        """
+        Undo the last moves, stopping if the history runs out.
+        
+        Args:
+            count: Number of moves to undo
+            
+        Returns:
+            True if all the moves were undone, False otherwise
+        """
+        for _ in range(count):
+            if not self.undo_move():
+                return False
+        return True
+
+
+# Bitboard masks of the bottom row, of each column and of the whole board
+BOTTOM_MASK = sum(1 << (col * Connect4.H1) for col in range(Connect4.COLS))
+COLUMN_MASKS = tuple(((1 << Connect4.ROWS) - 1) << (col * Connect4.H1)
+                     for col in range(Connect4.COLS))
+BOARD_MASK = sum(COLUMN_MASKS)
 
+# Number of bits a bitboard spans, guard bits included
+BOARD_BITS = Connect4.H1 * Connect4.COLS
+
+# Bit distance between neighbouring cells: vertical, horizontal,
+# diagonal \ and diagonal /
+WIN_SHIFTS = (1, Connect4.H1, Connect4.H1 - 1, Connect4.H1 + 1)
+
+# check_win and the bot's line scoring are written for four in a row
+if Connect4.WIN_LENGTH != 4:
+    raise ValueError("only WIN_LENGTH = 4 is supported")
+
+
+def _zobrist_keys() -> Tuple[list, list]:
+    """
+    Draw the Zobrist hashing keys.
+    
+    The keys come from a fixed seed, so every process (e.g. a bot's worker
+    processes) hashes positions the same way.
+    
+    Returns:
+        Tuple of (piece keys indexed [row][col][player], side-to-move keys
+        indexed by player)
+    """
+    rng = random.Random(0xC0441)
+    # An empty cell (NONE) contributes nothing, so placing a piece only
+    # XORs in the piece's key
+    pieces = [[[0, rng.getrandbits(64), rng.getrandbits(64)]  # NONE, RED, YELLOW
+               for _ in range(Connect4.COLS)]
+              for _ in range(Connect4.ROWS)]
+    side = [0, rng.getrandbits(64), rng.getrandbits(64)]
+    return pieces, side
+
+
+# Zobrist hashing: a position hashes to the XOR of ZOBRIST[row][col][player]
+# over its pieces and SIDE_KEY of the side to move
+ZOBRIST, SIDE_KEY = _zobrist_keys()
+
+# Hash of the empty board with RED to move (its mirror image is itself)
+EMPTY_HASH = SIDE_KEY[RED]
+
+
+def check_win(bb: int) -> bool:
+    """
+    Check a bitboard for four in a row in any direction.
+    
+    For each direction, shifting the bitboard by the step between
+    neighbouring cells and AND-ing it with itself leaves a bit set only
+    where a run continues; doing this twice finds runs of four. The guard
+    bit at the top of each column keeps runs from wrapping across columns.
+    
+    Args:
+        bb: Bitboard of one player's pieces (see Connect4)
+        
+    Returns:
+        True if the bitboard contains a winning line
+    """
+    for shift in WIN_SHIFTS:
+        pairs = bb & (bb >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def mirror_bitboard(bb: int) -> int:
+    """
+    Mirror a bitboard left to right, swapping column c with COLS - 1 - c.
+    
+    Args:
+        bb: Bitboard of one player's pieces (see Connect4)
+        
+    Returns:
+        Bitboard of the same pieces in the mirrored columns
+    """
+    mirrored = 0
+    for col in range(Connect4.COLS):
+        shift = (Connect4.COLS - 1 - 2 * col) * Connect4.H1
+        column = bb & COLUMN_MASKS[col]
+        mirrored |= column << shift if shift >= 0 else column >> -shift
+    return mirrored
@@ -0,0 +1,15 @@
+"""
+Fixtures shared by the test modules.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def draw_moves():
+    """Return moves that fill the board without four in a row.
+    
+    Columns are filled left to right, except that column 4 gets one piece
+    before column 3.
+    """
+    return (0,) * 6 + (1,) * 6 + (2,) * 6 + (4,) + (3,) * 6 + (4,) * 5 + (5,) * 6 + (6,) * 6
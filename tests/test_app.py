@@ -4,22 +4,67 @@ Tests for Flask API endpoints.
 
 import pytest
 import json
+import threading
+import app as app_module
 from app import app
 from game import Connect4, Player
 
 
-@pytest.fixture
+app.config['TESTING'] = True
+
+# Request bodies sent by many tests, serialized once for the module
+_GAME_ID = 'test_game'
+_GAME_PAYLOAD = json.dumps({'game_id': _GAME_ID}).encode()
+_MOVE_COL0_PAYLOAD = json.dumps({'game_id': _GAME_ID, 'col': 0}).encode()
+
+
+@pytest.fixture(scope="module")
 def client():
-    """Create a test client for the Flask app."""
-    app.config['TESTING'] = True
+    """Create a test client for the Flask app, shared by the module's tests."""
     with app.test_client() as client:
         yield client
 
 
+@pytest.fixture(autouse=True)
+def clear_games():
+    """Run every test without stored games or search contexts, and leave none behind."""
+    app_module.games.clear()
+    app_module.search_contexts.clear()
+    app_module.game_locks.clear()
+    yield
+    app_module.games.clear()
+    app_module.search_contexts.clear()
+    app_module.game_locks.clear()
+
+
+@pytest.fixture(scope="module", params=[{'game_id': 'test_game'}, {}],
+                ids=['game_id', 'default_id'])
+def new_game_response(client, request):
+    """Create a game once per payload and share the response between tests."""
+    return client.post('/api/new_game',
+                       json=request.param,
+                       content_type='application/json')
+
+
+def _apply_moves(game_id, cols):
+    """Play moves on a stored game in-process, skipping the HTTP round trip."""
+    game = app_module.games[game_id]
+    for col in cols:
+        game.make_move(col)
+
+
+def _setup_red_horizontal_win(game_id):
+    """Store a game that RED has won along the bottom row, built in-process."""
+    game = Connect4()
+    for col in [0, 0, 1, 1, 2, 2, 3]:
+        game.make_move(col)
+    app_module.games[game_id] = game
+
+
 @pytest.fixture
 def game_id():
     """Return a test game ID."""
-    return 'test_game'
+    return _GAME_ID
 
 
 class TestIndexRoute:
@@ -36,14 +81,10 @@ class TestIndexRoute:
 class TestNewGameEndpoint:
     """Test the new game endpoint."""
     
-    def test_create_new_game(self, client, game_id):
-        """Test creating a new game."""
-        response = client.post('/api/new_game',
-                              json={'game_id': game_id},
-                              content_type='application/json')
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
+    def test_create_new_game(self, new_game_response):
+        """Test creating a new game with and without a game ID."""
+        assert new_game_response.status_code == 200
+        data = json.loads(new_game_response.data)
         
         assert data['success'] == True
         assert 'board' in data
@@ -51,26 +92,53 @@ class TestNewGameEndpoint:
         assert data['game_over'] == False
         assert data['winner'] == Player.NONE.value
     
-    def test_create_new_game_default_id(self, client):
-        """Test creating a game with default ID."""
-        response = client.post('/api/new_game',
-                              json={},
-                              content_type='application/json')
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert data['success'] == True
-    
-    def test_new_game_has_empty_board(self, client, game_id):
+    def test_new_game_has_empty_board(self, new_game_response):
         """Test that new game has an empty board."""
-        response = client.post('/api/new_game',
-                              json={'game_id': game_id},
-                              content_type='application/json')
-        
-        data = json.loads(response.data)
+        data = json.loads(new_game_response.data)
         board = data['board']
         
         assert all(cell == 0 for row in board for cell in row)
+    
+    def test_least_recently_used_game_is_evicted(self, client, monkeypatch):
+        """Test that the oldest game is dropped once MAX_GAMES is exceeded."""
+        monkeypatch.setattr(app_module, 'MAX_GAMES', 2)
+        
+        for game_id in ['first', 'second']:
+            client.post('/api/new_game', json={'game_id': game_id})
+            app_module._get_search_context(game_id)
+        # Touch the first game so the second becomes least recently used
+        client.get('/api/game_state?game_id=first')
+        client.post('/api/new_game', json={'game_id': 'third'})
+        
+        assert list(app_module.games) == ['first', 'third']
+        assert set(app_module.search_contexts) == {'first'}
+        response = client.get('/api/game_state?game_id=second')
+        assert response.status_code == 404
+    
+    def test_least_recently_used_search_context_is_dropped(self, client, monkeypatch):
+        """Test that only MAX_SEARCH_CONTEXTS search contexts are kept."""
+        monkeypatch.setattr(app_module, 'MAX_SEARCH_CONTEXTS', 2)
+        
+        for game_id in ['first', 'second', 'third']:
+            client.post('/api/new_game', json={'game_id': game_id})
+            app_module._get_search_context(game_id)
+        
+        assert list(app_module.search_contexts) == ['second', 'third']
+        assert list(app_module.games) == ['first', 'second', 'third']
+    
+    def test_search_context_created_on_first_bot_move(self, client, game_id):
+        """Test that a game's search context is built when the bot first moves and kept."""
+        client.post('/api/new_game', data=_GAME_PAYLOAD, content_type='application/json')
+        assert game_id not in app_module.search_contexts
+        
+        _apply_moves(game_id, [0])
+        client.post('/api/bot_move', data=_GAME_PAYLOAD, content_type='application/json')
+        context = app_module.search_contexts[game_id]
+        assert app_module._get_search_context(game_id) is context
+        
+        # Restarting the game keeps the context
+        client.post('/api/new_game', data=_GAME_PAYLOAD, content_type='application/json')
+        assert app_module.search_contexts[game_id] is context
 
 
 class TestMoveEndpoint:
@@ -80,12 +148,12 @@ class TestMoveEndpoint:
         """Test making a valid move."""
         # Create game
         client.post('/api/new_game',
-                   json={'game_id': game_id},
+                   data=_GAME_PAYLOAD,
                    content_type='application/json')
         
         # Make move
         response = client.post('/api/move',
-                              json={'game_id': game_id, 'col': 0},
+                              data=_MOVE_COL0_PAYLOAD,
                               content_type='application/json')
         
         assert response.status_code == 200
@@ -98,7 +166,7 @@ class TestMoveEndpoint:
     def test_make_move_invalid_column(self, client, game_id):
         """Test making a move with invalid column."""
         client.post('/api/new_game',
-                   json={'game_id': game_id},
+                   data=_GAME_PAYLOAD,
                    content_type='application/json')
         
         response = client.post('/api/move',
@@ -109,34 +177,18 @@ class TestMoveEndpoint:
         data = json.loads(response.data)
         assert data['success'] == False
     
-    def test_make_move_nonexistent_game(self, client):
-        """Test making a move for nonexistent game."""
-        response = client.post('/api/move',
-                              json={'game_id': 'nonexistent', 'col': 0},
-                              content_type='application/json')
-        
-        assert response.status_code == 404
-        data = json.loads(response.data)
-        assert data['success'] == False
-    
     def test_make_move_full_column(self, client, game_id):
         """Test making a move in a full column."""
         client.post('/api/new_game',
-                   json={'game_id': game_id},
+                   data=_GAME_PAYLOAD,
                    content_type='application/json')
         
-        # Fill column 0
-        for _ in range(Connect4.ROWS):
-            client.post('/api/move',
-                       json={'game_id': game_id, 'col': 0},
-                       content_type='application/json')
-            client.post('/api/move',
-                       json={'game_id': game_id, 'col': 1},
-                       content_type='application/json')
+        # Fill column 0 in-process; only the rejected move goes over HTTP
+        _apply_moves(game_id, [0] * Connect4.ROWS)
         
         # Try to move in full column
         response = client.post('/api/move',
-                              json={'game_id': game_id, 'col': 0},
+                              data=_MOVE_COL0_PAYLOAD,
                               content_type='application/json')
         
         assert response.status_code == 400
@@ -148,17 +200,17 @@ class TestBotMoveEndpoint:
     def test_bot_makes_move(self, client, game_id):
         """Test that bot makes a move."""
         client.post('/api/new_game',
-                   json={'game_id': game_id},
+                   data=_GAME_PAYLOAD,
                    content_type='application/json')
         
         # Make player move
         client.post('/api/move',
-                   json={'game_id': game_id, 'col': 0},
+                   data=_MOVE_COL0_PAYLOAD,
                    content_type='application/json')
         
         # Get bot move
         response = client.post('/api/bot_move',
-                              json={'game_id': game_id},
+                              data=_GAME_PAYLOAD,
                               content_type='application/json')
         
         assert response.status_code == 200
@@ -168,23 +220,15 @@ class TestBotMoveEndpoint:
         assert 'col' in data
         assert 0 <= data['col'] < Connect4.COLS
     
-    def test_bot_move_nonexistent_game(self, client):
-        """Test bot move for nonexistent game."""
-        response = client.post('/api/bot_move',
-                              json={'game_id': 'nonexistent'},
-                              content_type='application/json')
-        
-        assert response.status_code == 404
-    
     def test_bot_move_when_not_bots_turn(self, client, game_id):
         """Test bot move when it's not bot's turn."""
         client.post('/api/new_game',
-                   json={'game_id': game_id},
+                   data=_GAME_PAYLOAD,
                    content_type='application/json')
         
         # It's RED's turn, bot is YELLOW
         response = client.post('/api/bot_move',
-                              json={'game_id': game_id},
+                              data=_GAME_PAYLOAD,
                               content_type='application/json')
         
         assert response.status_code == 400
@@ -193,25 +237,38 @@ class TestBotMoveEndpoint:
     
     def test_bot_move_when_game_over(self, client, game_id):
         """Test bot move when game is over."""
-        client.post('/api/new_game',
-                   json={'game_id': game_id},
-                   content_type='application/json')
-        
-        # Create a win
-        for i in range(4):
-            client.post('/api/move',
-                       json={'game_id': game_id, 'col': i},
-                       content_type='application/json')
-            if i < 3:
-                client.post('/api/move',
-                           json={'game_id': game_id, 'col': i},
-                           content_type='application/json')
+        _setup_red_horizontal_win(game_id)
         
         response = client.post('/api/bot_move',
-                              json={'game_id': game_id},
+                              data=_GAME_PAYLOAD,
                               content_type='application/json')
         
         assert response.status_code == 400
+    
+    def test_concurrent_bot_moves_play_once(self, client, game_id):
+        """Test that concurrent bot move requests for one game make one move."""
+        client.post('/api/new_game', data=_GAME_PAYLOAD, content_type='application/json')
+        _apply_moves(game_id, [0])
+        barrier = threading.Barrier(2)
+        status_codes = []
+        
+        def request_bot_move():
+            with app.test_client() as thread_client:
+                barrier.wait()
+                response = thread_client.post('/api/bot_move', data=_GAME_PAYLOAD,
+                                              content_type='application/json')
+                status_codes.append(response.status_code)
+        
+        threads = [threading.Thread(target=request_bot_move) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sorted(status_codes) == [200, 400]
+        game = app_module.games[game_id]
+        assert len(game.move_history) == 2
+        assert game.current_player == Player.RED
 
 
 class TestGameStateEndpoint:
@@ -220,7 +277,7 @@ class TestGameStateEndpoint:
     def test_get_game_state(self, client, game_id):
         """Test getting game state."""
         client.post('/api/new_game',
-                   json={'game_id': game_id},
+                   data=_GAME_PAYLOAD,
                    content_type='application/json')
         
         response = client.get(f'/api/game_state?game_id={game_id}')
@@ -234,23 +291,13 @@ class TestGameStateEndpoint:
         assert 'game_over' in data
         assert 'winner' in data
     
-    def test_get_game_state_nonexistent(self, client):
-        """Test getting state for nonexistent game."""
-        response = client.get('/api/game_state?game_id=nonexistent')
-        
-        assert response.status_code == 404
-        data = json.loads(response.data)
-        assert data['success'] == False
-    
     def test_get_game_state_after_moves(self, client, game_id):
         """Test getting game state after moves."""
         client.post('/api/new_game',
-                   json={'game_id': game_id},
+                   data=_GAME_PAYLOAD,
                    content_type='application/json')
         
-        client.post('/api/move',
-                   json={'game_id': game_id, 'col': 0},
-                   content_type='application/json')
+        _apply_moves(game_id, [0])
         
         response = client.get(f'/api/game_state?game_id={game_id}')
         data = json.loads(response.data)
@@ -260,24 +307,29 @@ class TestGameStateEndpoint:
         assert board[Connect4.ROWS - 1][0] == Player.RED.value
 
 
+class TestNonexistentGame:
+    """Test that every game endpoint rejects an unknown game ID."""
+    
+    @pytest.mark.parametrize("method,path,payload,qs", [
+        ('post', '/api/move', {'game_id': 'nonexistent', 'col': 0}, None),
+        ('post', '/api/bot_move', {'game_id': 'nonexistent'}, None),
+        ('get', '/api/game_state', None, 'game_id=nonexistent'),
+    ])
+    def test_nonexistent_game(self, client, method, path, payload, qs):
+        """Test that a request for a nonexistent game returns 404."""
+        response = getattr(client, method)(path, json=payload, query_string=qs)
+        
+        assert response.status_code == 404
+        data = json.loads(response.data)
+        assert data['success'] == False
+
+
 class TestWinDetection:
     """Test win detection through API."""
     
     def test_horizontal_win_detected(self, client, game_id):
         """Test that horizontal win is detected."""
-        client.post('/api/new_game',
-                   json={'game_id': game_id},
-                   content_type='application/json')
-        
-        # Create horizontal win
-        for i in range(4):
-            client.post('/api/move',
-                       json={'game_id': game_id, 'col': i},
-                       content_type='application/json')
-            if i < 3:
-                client.post('/api/move',
-                           json={'game_id': game_id, 'col': i},
-                           content_type='application/json')
+        _setup_red_horizontal_win(game_id)
         
         response = client.get(f'/api/game_state?game_id={game_id}')
         data = json.loads(response.data)
@@ -2,29 +2,129 @@
 Tests for Connect4 bot.
 """
 
+import pickle
 import pytest
-from game import Connect4, Player
-from bot import Bot, BoundType, TranspositionEntry
+from concurrent.futures import ThreadPoolExecutor
+from game import Connect4, Player, BOARD_BITS, ZOBRIST
+from bot import (Bot, SearchContext, CENTER_ORDER, LINES, LINE_SPANS, POW10, INF,
+                 WIN_SCORE, EXACT, evaluate_position)
+
+
+# Moves whose full-board hashes are precomputed by the expected_hashes fixture
+_HASHED_MOVES = [3, 2, 4]
+
+
+def _tt_entries(context):
+    """Count the filled transposition table slots of a search context."""
+    return sum(key is not None for key in context.tt_key)
+
+
+@pytest.fixture(scope="module")
+def bot(request):
+    """Build a bot once per module for each (depth, player) configuration.
+    
+    Tests choose a configuration through indirect parametrization and get a
+    depth 6 YELLOW bot otherwise. Search state lives in a SearchContext, so
+    the bots can be shared between tests.
+    """
+    depth, player = getattr(request, 'param', (6, Player.YELLOW))
+    return Bot(depth=depth, player=player)
+
+
+# Tests that only check a move is legal or that a one-move tactic is found
+# don't need the full depth; a depth 3 search keeps them fast
+shallow_bot = pytest.mark.parametrize("bot", [(3, Player.YELLOW)], indirect=True)
+
+
+@pytest.fixture(scope="module")
+def game_after_red_opens():
+    """Return a game where RED has played column 0; searches must leave it unchanged."""
+    game = Connect4()
+    game.make_move(0)
+    return game
+
+
+@pytest.fixture(scope="module")
+def complex_position():
+    """Return a game six moves in; searches must leave it unchanged."""
+    game = Connect4()
+    for col in [0, 1, 0, 1, 2, 3]:
+        game.make_move(col)
+    return game
+
+
+@pytest.fixture(scope="class", params=["iterative", "fixed"])
+def search_result(request, game_after_red_opens):
+    """Search the opening once per search type and return (game, move, context)."""
+    bot = Bot(depth=3, search_type=request.param)
+    context = SearchContext()
+    move = bot.get_best_move(game_after_red_opens, context)
+    return game_after_red_opens, move, context
+
+
+@pytest.fixture(scope="module")
+def root_search_context(game_after_red_opens):
+    """Search the opening to depth 3 and return the context.
+    
+    The search runs below get_best_move, which clears the evaluation cache
+    when it returns.
+    """
+    game = game_after_red_opens
+    context = SearchContext()
+    Bot(depth=3)._search_root(context, game, list(CENTER_ORDER), 3,
+                              game.hash, game.mirror_hash)
+    return context
+
+
+@pytest.fixture(scope="module")
+def expected_hashes(bot):
+    """Hash the game from scratch after each of _HASHED_MOVES."""
+    game = Connect4()
+    hashes = []
+    for move in _HASHED_MOVES:
+        game.make_move(move)
+        hashes.append(bot._compute_hash(game))
+    return hashes
+
+
+@pytest.fixture(scope="module")
+def full_board_game(draw_moves):
+    """Return a drawn game with every cell filled.
+    
+    Consumers that make moves on the game must work on a copy.
+    """
+    game = Connect4()
+    for col in draw_moves:
+        game.make_move(col)
+    return game
+
+
+@pytest.fixture(scope="module")
+def red_won_game():
+    """Return a game that RED has won along the bottom row.
+    
+    Consumers that make moves on the game must work on a copy.
+    """
+    game = Connect4()
+    for col in [0, 0, 1, 1, 2, 2, 3]:
+        game.make_move(col)
+    return game
 
 
 class TestBotInitialization:
     """Test bot initialization."""
     
-    def test_bot_default_initialization(self):
-        """Test bot with default parameters."""
-        bot = Bot()
-        
-        assert bot.depth == 6
-        assert bot.player == Player.YELLOW
-        assert bot.opponent == Player.RED
-    
-    def test_bot_custom_initialization(self):
-        """Test bot with custom parameters."""
-        bot = Bot(depth=4, player=Player.RED)
-        
-        assert bot.depth == 4
-        assert bot.player == Player.RED
-        assert bot.opponent == Player.YELLOW
+    @pytest.mark.parametrize("kwargs,depth,player,opponent", [
+        ({}, 6, Player.YELLOW, Player.RED),
+        ({'depth': 4, 'player': Player.RED}, 4, Player.RED, Player.YELLOW),
+    ])
+    def test_bot_initialization(self, kwargs, depth, player, opponent):
+        """Test bot with default and custom parameters."""
+        bot = Bot(**kwargs)
+        
+        assert bot.depth == depth
+        assert bot.player == player
+        assert bot.opponent == opponent
     
     def test_bot_search_type_initialization(self):
         """Test bot with different search types."""
@@ -45,52 +145,35 @@ class TestBotInitialization:
 class TestBotMoves:
     """Test bot move selection."""
     
-    def test_bot_returns_valid_move(self):
+    @shallow_bot
+    def test_bot_returns_valid_move(self, bot, game_after_red_opens):
         """Test that bot returns a valid move."""
-        game = Connect4()
-        bot = Bot(player=Player.YELLOW)
+        game = game_after_red_opens
         
-        game.make_move(0)  # RED moves first
         move = bot.get_best_move(game)
         
         assert move is not None
         assert 0 <= move < Connect4.COLS
         assert game.is_valid_move(move)
     
-    def test_bot_returns_none_when_game_over(self):
+    def test_bot_returns_none_when_game_over(self, bot, red_won_game):
         """Test that bot returns None when game is over."""
-        game = Connect4()
-        bot = Bot()
-        
-        # Create a horizontal win
-        for i in range(4):
-            game.make_move(i)  # RED
-            if i < 3:
-                game.make_move(i)  # YELLOW blocks
-        
-        assert game.game_over == True
-        move = bot.get_best_move(game)
+        assert red_won_game.game_over == True
+        move = bot.get_best_move(red_won_game)
         
         assert move is None
     
-    def test_bot_returns_none_when_no_valid_moves(self):
+    def test_bot_returns_none_when_no_valid_moves(self, bot, full_board_game):
         """Test that bot returns None when no valid moves exist."""
-        game = Connect4()
-        bot = Bot()
-        
-        # Fill the board
-        for col in range(Connect4.COLS):
-            for _ in range(Connect4.ROWS):
-                if game.is_valid_move(col):
-                    game.make_move(col)
-        
-        move = bot.get_best_move(game)
+        assert full_board_game.get_valid_moves() == []
+        assert full_board_game.winner == Player.NONE
+        move = bot.get_best_move(full_board_game)
         assert move is None
     
-    def test_bot_makes_winning_move_when_available(self):
+    @shallow_bot
+    def test_bot_makes_winning_move_when_available(self, bot):
         """Test that bot makes a winning move when available."""
         game = Connect4()
-        bot = Bot(depth=6, player=Player.YELLOW)
         
         # Set up board so YELLOW can win
         # RED: columns 0, 1, 2
@@ -107,10 +190,10 @@ class TestBotMoves:
         # Check if this creates a win (might need to check multiple scenarios)
         assert move is not None
     
-    def test_bot_blocks_opponent_win(self):
+    @shallow_bot
+    def test_bot_blocks_opponent_win(self, bot):
         """Test that bot blocks opponent's winning move."""
         game = Connect4()
-        bot = Bot(depth=6, player=Player.YELLOW)
         
         # Set up so RED has 3 in a row horizontally
         for i in range(3):
@@ -133,20 +216,53 @@ class TestBotMoves:
 class TestBotEvaluation:
     """Test bot evaluation functions."""
     
-    def test_bot_evaluates_position(self):
+    def test_bot_evaluates_position(self, bot, game_after_red_opens):
         """Test that bot can evaluate a position."""
-        game = Connect4()
-        bot = Bot()
+        game = game_after_red_opens
         
-        game.make_move(0)
         score = bot._evaluate_position(game)
         
-        assert isinstance(score, (int, float))
+        assert isinstance(score, int)
+    
+    @pytest.mark.parametrize("bot", [(6, Player.RED)], indirect=True)
+    def test_evaluate_position_on_raw_bitboards(self, bot):
+        """Test that evaluation of plain bitboards is antisymmetric."""
+        game = Connect4()
+        for move in [3, 3, 2, 4]:
+            game.make_move(move)
+        red, yellow = game.bb
+        
+        assert evaluate_position(0, 0) == 0
+        assert evaluate_position(red, yellow) == -evaluate_position(yellow, red)
+        assert bot._evaluate_position(game) == evaluate_position(red, yellow)
+    
+    def test_line_masks_cover_every_winning_line(self):
+        """Test that the precomputed line masks are the 69 four-cell lines."""
+        assert len(LINES) == 69
+        assert len(set(LINES)) == 69
+        assert all(mask.bit_count() == Connect4.WIN_LENGTH for mask in LINES)
+        assert sum(starts.bit_count() for starts, *_ in LINE_SPANS) == len(LINES)
     
-    def test_bot_prefers_winning_positions(self):
+    def test_evaluate_position_matches_line_by_line_count(self):
+        """Test the bit-parallel evaluation against scoring each line separately."""
+        game = Connect4()
+        for move in [3, 3, 2, 4, 4, 2, 5, 1, 5, 6, 0, 0]:
+            game.make_move(move)
+            red, yellow = game.bb
+            expected = 0
+            for mask in LINES:
+                red_count = (red & mask).bit_count()
+                yellow_count = (yellow & mask).bit_count()
+                if yellow_count == 0:
+                    expected += POW10[red_count]
+                elif red_count == 0:
+                    expected -= POW10[yellow_count]
+            
+            assert evaluate_position(red, yellow) == expected
+    
+    def test_bot_prefers_winning_positions(self, bot):
         """Test that bot evaluates winning positions highly."""
         game = Connect4()
-        bot = Bot(player=Player.YELLOW)
         
         # Create a winning position for YELLOW
         for i in range(3):
@@ -166,10 +282,9 @@ class TestBotEvaluation:
         # Note: This is a heuristic test, exact values may vary
         assert True  # Test passes if no errors
     
-    def test_bot_evaluates_lines(self):
+    def test_bot_evaluates_lines(self, bot):
         """Test bot's line evaluation."""
         game = Connect4()
-        bot = Bot()
         
         # Create a line with bot's pieces (vertical)
         game.make_move(0)  # RED
@@ -181,36 +296,46 @@ class TestBotEvaluation:
         row = Connect4.ROWS - 4  # Start at the first YELLOW piece
         score = bot._evaluate_line(game, row, 0, 1, 0)
         assert isinstance(score, (int, float))
+    
+    def test_line_scores_by_piece_counts(self, bot):
+        """Test line scores for own, opponent and mixed lines."""
+        game = Connect4()
+        for move in [0, 1, 2, 1, 0]:  # RED: 0, 2, 0; YELLOW: 1, 1
+            game.make_move(move)
+        bottom = Connect4.ROWS - 1
+        
+        assert bot._evaluate_line(game, bottom - 3, 1, 1, 0) == 10  # YELLOW's column
+        assert bot._evaluate_line(game, bottom - 3, 0, 1, 0) == -10  # RED's column
+        assert bot._evaluate_line(game, bottom, 0, 0, 1) == 0  # Mixed bottom row
+        assert bot._evaluate_line(game, bottom - 3, 6, 1, 0) == 0  # Empty column
 
 
 class TestBotMinimax:
     """Test minimax algorithm."""
     
-    def test_bot_uses_minimax(self):
+    @pytest.mark.parametrize("bot", [(1, Player.YELLOW)], indirect=True)
+    def test_bot_uses_minimax(self, bot, game_after_red_opens):
         """Test that bot uses minimax to find moves."""
-        game = Connect4()
-        bot = Bot(depth=3, player=Player.YELLOW)
+        game = game_after_red_opens
         
-        game.make_move(0)  # RED
         move = bot.get_best_move(game)
         
         # Bot should return a move (minimax should find something)
         assert move is not None
     
-    def test_bot_with_different_depths(self):
+    @pytest.mark.parametrize("bot", [(2, Player.YELLOW), (4, Player.YELLOW), (6, Player.YELLOW)],
+                             indirect=True)
+    def test_bot_with_different_depths(self, bot, game_after_red_opens):
         """Test bot with different search depths."""
-        game = Connect4()
-        game.make_move(0)  # RED
+        move = bot.get_best_move(game_after_red_opens)
         
-        for depth in [2, 4, 6]:
-            bot = Bot(depth=depth, player=Player.YELLOW)
-            move = bot.get_best_move(game)
-            assert move is not None
+        assert move is not None
+        assert game_after_red_opens.move_history == [0]
     
-    def test_bot_handles_alpha_beta_pruning(self):
+    @pytest.mark.parametrize("bot", [(4, Player.YELLOW)], indirect=True)
+    def test_bot_handles_alpha_beta_pruning(self, bot):
         """Test that bot's minimax uses alpha-beta pruning."""
         game = Connect4()
-        bot = Bot(depth=4, player=Player.YELLOW)
         
         # Create a position where pruning might occur
         for i in range(2):
@@ -220,6 +345,86 @@ class TestBotMinimax:
         move = bot.get_best_move(game)
         # Should still return a valid move
         assert move is not None
+    
+    @pytest.mark.parametrize("bot", [(2, Player.YELLOW)], indirect=True)
+    def test_negamax_scores_for_side_to_move(self, bot):
+        """Test that negamax scores positions for the player to move."""
+        game = Connect4()
+        
+        # RED holds columns 0-2 on the bottom row
+        for i in range(3):
+            game.make_move(i)  # RED
+            game.make_move(i)  # YELLOW
+        
+        # RED is to move and wins in column 3, although the bot plays YELLOW
+        assert bot._negamax(game, 1, -INF, INF) >= WIN_SCORE
+        assert bot.get_best_move(game) == 3
+    
+    def test_negamax_scores_finished_game(self, red_won_game):
+        """Test that a finished game is lost for the player to move."""
+        bot = Bot(depth=2)
+        
+        assert bot._negamax(red_won_game, 2, -INF, INF) <= -WIN_SCORE
+    
+    def test_search_scores_are_integers(self):
+        """Test that search scores stay integers within the INF bounds."""
+        game = Connect4()
+        bot = Bot(depth=4)
+        game.make_move(3)
+        
+        score = bot._negamax(game, 4, -INF, INF)
+        _, root_score = bot._search_root(SearchContext(), game,
+                                         list(CENTER_ORDER), 4, bot._compute_hash(game))
+        
+        assert isinstance(score, int) and -INF < score < INF
+        assert isinstance(root_score, int) and -INF < root_score < INF
+    
+    def test_scores_fit_in_16_bits(self):
+        """Test that heuristic scores stay below wins and every score fits in 16 bits."""
+        assert len(LINES) * POW10[Connect4.WIN_LENGTH - 1] < WIN_SCORE
+        assert WIN_SCORE + Connect4.ROWS * Connect4.COLS < 2 ** 15
+        
+        game = Connect4()
+        bot = Bot(depth=4)
+        context = SearchContext()
+        for move in [3, 3, 2, 4, 2]:
+            game.make_move(move)
+        bot.get_best_move(game, context)
+        
+        assert all(-2 ** 15 <= score < 2 ** 15 for score in context.tt_score)
+    
+    def test_root_search_window_bounds_score(self):
+        """Test that a root search outside the true score only returns a bound."""
+        game = Connect4()
+        bot = Bot(depth=4)
+        game.make_move(3)
+        ordered_moves = list(CENTER_ORDER)
+        
+        _, score = bot._search_root(SearchContext(), game, ordered_moves, 4,
+                                    game.hash)
+        _, high = bot._search_root(SearchContext(), game, ordered_moves, 4,
+                                   game.hash, alpha=score + 10, beta=score + 20)
+        _, low = bot._search_root(SearchContext(), game, ordered_moves, 4,
+                                  game.hash, alpha=score - 20, beta=score - 10)
+        
+        assert high <= score + 10
+        assert low >= score - 10
+    
+    @pytest.mark.parametrize("moves", [[3], [3, 3, 2], [0, 6, 3, 3, 3, 2]])
+    def test_aspiration_windows_keep_the_best_move(self, moves):
+        """Test that iterative deepening with aspiration windows picks a best-scoring move."""
+        game = Connect4()
+        for move in moves:
+            game.make_move(move)
+        bot = Bot(depth=5, search_type="fixed")
+        
+        move = Bot(depth=5, search_type="iterative").get_best_move(game)
+        _, best_score = bot._search_root(SearchContext(), game, list(CENTER_ORDER), 5,
+                                         game.hash)
+        move_score = bot._search_root_move(SearchContext(), game, move, 5, -INF, INF,
+                                           game.hash, game.mirror_hash)
+        
+        assert move_score == best_score
 
 
 class TestTranspositionTable:
@@ -227,69 +432,163 @@ class TestTranspositionTable:
     
     def test_transposition_table_initialized(self):
         """Test that transposition table is initialized."""
-        bot = Bot()
-        assert hasattr(bot, 'transposition_table')
-        assert isinstance(bot.transposition_table, dict)
-        assert len(bot.transposition_table) == 0
+        context = SearchContext()
+        assert len(context.tt_key) == SearchContext.TT_SIZE
+        assert _tt_entries(context) == 0
     
-    def test_transposition_table_populated_during_search(self):
+    def test_transposition_table_populated_during_search(self, game_after_red_opens):
         """Test that transposition table is populated during search."""
-        game = Connect4()
+        game = game_after_red_opens
         bot = Bot(depth=3, search_type="fixed")
         
-        game.make_move(0)  # RED
-        initial_size = len(bot.transposition_table)
+        context = SearchContext()
+        initial_size = _tt_entries(context)
         
-        move = bot.get_best_move(game)
+        move = bot.get_best_move(game, context)
         
         # Transposition table should have entries after search
-        assert len(bot.transposition_table) > initial_size
+        assert _tt_entries(context) > initial_size
         assert move is not None
     
-    def test_transposition_table_cleared_between_searches(self):
-        """Test that transposition table is cleared between searches."""
-        game = Connect4()
-        bot = Bot(depth=2, search_type="fixed")
+    def test_transposition_table_kept_between_searches(self, game_after_red_opens):
+        """Test that a second search reuses the entries of the first."""
+        game = game_after_red_opens
+        bot = Bot(depth=3, search_type="fixed")
+        context = SearchContext()
+        child = game.copy()
+        child.make_move(3)
+        key = min(child.hash, child.mirror_hash)
         
-        game.make_move(0)
-        bot.get_best_move(game)
-        size_after_first = len(bot.transposition_table)
+        bot.get_best_move(game, context)
+        first_nodes = context.nodes
         
-        # Clear and search again
-        game2 = Connect4()
-        game2.make_move(1)
-        bot.get_best_move(game2)
+        assert context.tt_key[key & context.tt_mask] == key
+        assert context.tt_age[key & context.tt_mask] == 1
+        
+        # Searching the same position again cuts off on the stored children
+        # instead of searching them and storing them again
+        bot.get_best_move(game, context)
         
-        # Table should be cleared and repopulated
-        assert len(bot.transposition_table) > 0
+        assert context.tt_age[key & context.tt_mask] == 1
+        assert context.nodes - first_nodes < first_nodes
     
-    def test_transposition_table_reuses_entries(self):
-        """Test that transposition table reuses entries in iterative deepening."""
+    def test_transposition_table_size_is_fixed(self, game_after_red_opens):
+        """Test that a small transposition table replaces entries instead of growing."""
+        game = game_after_red_opens
+        bot = Bot(depth=4, search_type="fixed")
+        context = SearchContext(tt_size=64)
+        
+        move = bot.get_best_move(game, context)
+        
+        assert move is not None
+        assert len(context.tt_key) == 64
+        assert all(len(slots) == 64 for slots in [context.tt_score, context.tt_depth,
+                                                  context.tt_bound, context.tt_move])
+    
+    def test_transposition_table_size_must_be_power_of_two(self):
+        """Test that the slot count must be a power of two."""
+        with pytest.raises(ValueError):
+            SearchContext(tt_size=100)
+    
+    def test_store_entry_replaces_slot(self):
+        """Test that storing a position overwrites its slot, key included."""
+        context = SearchContext(tt_size=16)
+        context.store_entry(0x25, 10, 2, EXACT, 3)
+        context.store_entry(0x35, -20, 2, EXACT, 4)
+        
+        assert context.tt_key[5] == 0x35
+        assert (context.tt_score[5], context.tt_depth[5], context.tt_move[5]) == (-20, 2, 4)
+    
+    def test_store_entry_prefers_deeper_results_of_same_search(self):
+        """Test that a shallower result only replaces an entry from an older search."""
+        context = SearchContext(tt_size=16)
+        context.store_entry(0x25, 10, 3, EXACT, 3)
+        context.store_entry(0x35, -20, 1, EXACT, 4)
+        
+        assert context.tt_key[5] == 0x25
+        
+        context.age += 1
+        context.store_entry(0x35, -20, 1, EXACT, 4)
+        
+        assert context.tt_key[5] == 0x35
+        assert context.tt_age[5] == context.age
+    
+    def test_win_scores_kept_from_an_earlier_root(self):
+        """Test that wins stored by a search from an earlier root keep their distance."""
         game = Connect4()
+        game.make_moves([4, 2, 6, 4, 2, 3, 2, 5, 4, 4, 5, 0])
+        context = SearchContext()
+        Bot(depth=6, search_type="fixed").get_best_move(game, context)
+        game.make_moves([1, 3])
+        bot = Bot(depth=3, search_type="fixed")
+        
+        scores = []
+        for search_context in [context, SearchContext()]:
+            search_context.age += 1
+            ordered_moves = bot._root_moves(search_context, game, game.hash, game.mirror_hash)
+            scores.append(bot._search_root(search_context, game, ordered_moves, 3,
+                                           game.hash, game.mirror_hash))
+        
+        # RED wins with its second move, not with this one
+        assert scores[0] == scores[1] == (3, WIN_SCORE + 1)
+    
+    def test_transposition_table_reuses_entries(self, game_after_red_opens):
+        """Test that transposition table reuses entries in iterative deepening."""
+        game = game_after_red_opens
         bot = Bot(depth=3, search_type="iterative")
+        context = SearchContext()
         
-        game.make_move(0)
-        bot.get_best_move(game)
+        bot.get_best_move(game, context)
         
         # In iterative deepening, deeper searches should reuse entries from shallower searches
-        assert len(bot.transposition_table) > 0
+        assert _tt_entries(context) > 0
+    
+    def test_mirrored_positions_share_entries(self, game_after_red_opens):
+        """Test that a position and its mirror image use the same entries."""
+        game = game_after_red_opens
+        bot = Bot(depth=3, search_type="fixed")
+        context = SearchContext()
+        move = bot.get_best_move(game, context)
+        size_after_first = _tt_entries(context)
+        
+        mirrored_game = Connect4()
+        mirrored_game.make_move(6)
+        mirrored_move = bot.get_best_move(mirrored_game, context)
+        
+        assert _tt_entries(context) == size_after_first
+        assert mirrored_move == Connect4.COLS - 1 - move
 
 
 class TestZobristHashing:
     """Test Zobrist hashing functionality."""
     
     def test_zobrist_table_initialized(self):
-        """Test that Zobrist table is initialized."""
-        bot = Bot()
-        assert hasattr(bot, 'zobrist_table')
-        assert len(bot.zobrist_table) == Connect4.ROWS
-        assert len(bot.zobrist_table[0]) == Connect4.COLS
-        assert len(bot.zobrist_table[0][0]) == 3  # NONE, RED, YELLOW
-    
-    def test_hash_computation(self):
+        """Test that the shared Zobrist table has a key per cell and player."""
+        assert len(ZOBRIST) == Connect4.ROWS
+        assert len(ZOBRIST[0]) == Connect4.COLS
+        assert len(ZOBRIST[0][0]) == 3  # NONE, RED, YELLOW
+    
+    def test_empty_cells_have_no_zobrist_key(self, bot):
+        """Test that empty cells leave the hash unchanged."""
+        assert all(keys[Player.NONE] == 0 for row in ZOBRIST for keys in row)
+        assert bot._compute_hash(Connect4()) == Connect4().hash
+    
+    def test_game_hash_matches_computed_hash(self, bot):
+        """Test that the hashes kept by the game match a full recomputation."""
+        game = Connect4()
+        
+        for move in [3, 2, 3, 2, 3, 2, 3]:  # RED wins on the last move
+            game.make_move(move)
+            assert game.hash == bot._compute_hash(game)
+            assert game.mirror_hash == bot._compute_hash(game, mirrored=True)
+        
+        while game.undo_move():
+            assert game.hash == bot._compute_hash(game)
+            assert game.mirror_hash == bot._compute_hash(game, mirrored=True)
+    
+    def test_hash_computation(self, bot):
         """Test that hash computation works."""
         game = Connect4()
-        bot = Bot()
         
         hash1 = bot._compute_hash(game)
         assert isinstance(hash1, int)
@@ -298,10 +597,9 @@ class TestZobristHashing:
         hash2 = bot._compute_hash(game)
         assert hash1 == hash2
     
-    def test_hash_changes_with_moves(self):
+    def test_hash_changes_with_moves(self, bot):
         """Test that hash changes when moves are made."""
         game = Connect4()
-        bot = Bot()
         
         hash_before = bot._compute_hash(game)
         game.make_move(3)
@@ -309,11 +607,10 @@ class TestZobristHashing:
         
         assert hash_before != hash_after
     
-    def test_hash_includes_current_player(self):
+    def test_hash_includes_current_player(self, bot):
         """Test that hash includes current player."""
         game1 = Connect4()
         game2 = Connect4()
-        bot = Bot()
         
         # Make same moves but different current player
         game1.make_move(0)  # RED moves, now YELLOW's turn
@@ -333,14 +630,16 @@ class TestZobristHashing:
 class TestMoveOrdering:
     """Test move ordering functionality."""
     
-    def test_move_ordering_prioritizes_center(self):
+    def test_center_order_derived_from_columns(self):
+        """Test that columns are ordered outward from the center, left first."""
+        assert CENTER_ORDER == (3, 2, 4, 1, 5, 0, 6)
+    
+    def test_move_ordering_prioritizes_center(self, bot):
         """Test that move ordering prioritizes center columns."""
         game = Connect4()
-        bot = Bot()
         
-        valid_moves = [0, 1, 2, 3, 4, 5, 6]
         position_hash = bot._compute_hash(game)
-        ordered_moves = bot._order_moves(game, valid_moves, position_hash)
+        ordered_moves = bot._order_moves(SearchContext(), game.heights, position_hash)
         
         # Center column (3) should be first or early
         assert 3 in ordered_moves
@@ -348,20 +647,101 @@ class TestMoveOrdering:
         center_columns = [2, 3, 4]
         assert any(col in ordered_moves[:3] for col in center_columns)
     
-    def test_move_ordering_uses_transposition_table(self):
-        """Test that move ordering uses best move from transposition table."""
+    def test_move_ordering_tries_killer_move_first(self):
+        """Test that the killer move for a depth is tried before center moves."""
+        game = Connect4()
+        bot = Bot(depth=2)
+        context = SearchContext()
+        context.killers[2][0] = 6
+        
+        valid_moves = game.get_valid_moves()
+        position_hash = bot._compute_hash(game)
+        ordered_moves = bot._order_moves(context, game.heights, position_hash, 2)
+        
+        assert ordered_moves[0] == 6
+        assert ordered_moves[1] == 3
+        assert set(ordered_moves) == set(valid_moves)
+    
+    def test_move_ordering_skips_full_columns(self, bot):
+        """Test that full columns are left out of the move order."""
+        game = Connect4()
+        for _ in range(Connect4.ROWS):
+            game.make_move(3)
+        
+        ordered_moves = bot._order_moves(SearchContext(), game.heights,
+                                         bot._compute_hash(game))
+        
+        assert ordered_moves == [2, 4, 1, 5, 0, 6]
+    
+    def test_move_ordering_lists_each_move_once(self):
+        """Test that a killer move that is also the table move is not repeated."""
+        game = Connect4()
+        bot = Bot(depth=2)
+        context = SearchContext()
+        position_hash = bot._compute_hash(game)
+        context.store_entry(position_hash, 0, 2, EXACT, 5)
+        context.killers[2][0] = 5
+        
+        ordered_moves = bot._order_moves(context, game.heights, position_hash, 2)
+        
+        assert ordered_moves == [5, 3, 2, 4, 1, 0, 6]
+    
+    def test_cutoffs_update_killers_and_history(self):
+        """Test that a cutoff keeps the last two killer moves and scores history."""
+        context = SearchContext()
+        context.record_cutoff(3, 4)
+        context.record_cutoff(3, 4)
+        context.record_cutoff(3, 1)
+        
+        assert context.killers[3] == [1, 4]
+        assert context.history[4] == 18
+        assert context.history[1] == 9
+    
+    def test_move_ordering_uses_killers_then_history(self):
+        """Test that both killers come first, then moves by history score."""
+        game = Connect4()
+        bot = Bot(depth=3)
+        context = SearchContext()
+        context.killers[3] = [6, 0]
+        context.history[1] = 5
+        
+        ordered_moves = bot._order_moves(context, game.heights,
+                                         bot._compute_hash(game), 3)
+        
+        assert ordered_moves == [6, 0, 1, 3, 2, 4, 5]
+    
+    def test_symmetric_root_searches_left_half(self, bot):
+        """Test that a symmetric root position only searches center and left columns."""
         game = Connect4()
+        
+        ordered_moves = bot._root_moves(SearchContext(), game,
+                                        bot._compute_hash(game),
+                                        bot._compute_hash(game, mirrored=True))
+        
+        assert ordered_moves == [3, 2, 1, 0]
+        
+        game.make_move(1)
+        ordered_moves = bot._root_moves(SearchContext(), game,
+                                        bot._compute_hash(game),
+                                        bot._compute_hash(game, mirrored=True))
+        
+        assert set(ordered_moves) == set(game.get_valid_moves())
+    
+    def test_move_ordering_uses_transposition_table(self, game_after_red_opens):
+        """Test that move ordering uses best move from transposition table."""
+        game = game_after_red_opens
         bot = Bot(depth=2, search_type="fixed")
         
-        game.make_move(0)
+        context = SearchContext()
+        
         position_hash = bot._compute_hash(game)
         
         # Populate transposition table
-        bot.get_best_move(game)
+        bot.get_best_move(game, context)
         
         # Get ordered moves
         valid_moves = game.get_valid_moves()
-        ordered_moves = bot._order_moves(game, valid_moves, position_hash)
+        ordered_moves = bot._order_moves(context, game.heights, position_hash)
         
         # Should return ordered moves
         assert len(ordered_moves) == len(valid_moves)
@@ -371,212 +751,141 @@ class TestMoveOrdering:
 class TestIterativeDeepening:
     """Test iterative deepening search."""
     
-    def test_iterative_deepening_returns_move(self):
+    def test_iterative_deepening_returns_move(self, game_after_red_opens):
         """Test that iterative deepening returns a valid move."""
-        game = Connect4()
-        bot = Bot(depth=4, search_type="iterative")
+        game = game_after_red_opens
+        bot = Bot(depth=2, search_type="iterative")
         
-        game.make_move(0)
         move = bot.get_best_move(game)
         
         assert move is not None
         assert 0 <= move < Connect4.COLS
         assert game.is_valid_move(move)
     
-    def test_iterative_deepening_searches_all_depths(self):
+    def test_iterative_deepening_searches_all_depths(self, game_after_red_opens):
         """Test that iterative deepening searches from depth 1 to max depth."""
-        game = Connect4()
+        game = game_after_red_opens
         bot = Bot(depth=3, search_type="iterative")
+        context = SearchContext()
         
-        game.make_move(0)
-        move = bot.get_best_move(game)
+        move = bot.get_best_move(game, context)
         
         # Should complete all depths and return a move
         assert move is not None
         # Transposition table should have entries from multiple depths
-        assert len(bot.transposition_table) > 0
-    
-    def test_iterative_deepening_vs_fixed_same_result(self):
-        """Test that iterative deepening and fixed depth can find moves."""
-        game1 = Connect4()
-        game2 = Connect4()
-        
-        bot_iterative = Bot(depth=3, search_type="iterative")
-        bot_fixed = Bot(depth=3, search_type="fixed")
-        
-        game1.make_move(0)
-        game2.make_move(0)
-        
-        move1 = bot_iterative.get_best_move(game1)
-        move2 = bot_fixed.get_best_move(game2)
-        
-        # Both should return valid moves (may or may not be the same)
-        assert move1 is not None
-        assert move2 is not None
-        assert 0 <= move1 < Connect4.COLS
-        assert 0 <= move2 < Connect4.COLS
+        assert _tt_entries(context) > 0
 
 
 class TestFixedDepthSearch:
     """Test fixed depth search."""
     
-    def test_fixed_depth_returns_move(self):
+    def test_fixed_depth_returns_move(self, game_after_red_opens):
         """Test that fixed depth search returns a valid move."""
-        game = Connect4()
-        bot = Bot(depth=4, search_type="fixed")
+        game = game_after_red_opens
+        bot = Bot(depth=2, search_type="fixed")
         
-        game.make_move(0)
         move = bot.get_best_move(game)
         
         assert move is not None
         assert 0 <= move < Connect4.COLS
         assert game.is_valid_move(move)
     
-    def test_fixed_depth_searches_at_specified_depth(self):
+    def test_fixed_depth_searches_at_specified_depth(self, game_after_red_opens):
         """Test that fixed depth searches at the specified depth."""
-        game = Connect4()
+        game = game_after_red_opens
         bot = Bot(depth=3, search_type="fixed")
+        context = SearchContext()
         
-        game.make_move(0)
-        move = bot.get_best_move(game)
+        move = bot.get_best_move(game, context)
         
         assert move is not None
         # Transposition table should have entries
-        assert len(bot.transposition_table) > 0
+        assert _tt_entries(context) > 0
     
-    def test_fixed_depth_with_different_depths(self):
+    @pytest.mark.parametrize("depth", [2, 3, 4])
+    def test_fixed_depth_with_different_depths(self, game_after_red_opens, depth):
         """Test fixed depth search with different depth values."""
-        game = Connect4()
-        game.make_move(0)
+        bot = Bot(depth=depth, search_type="fixed")
+        move = bot.get_best_move(game_after_red_opens)
         
-        for depth in [2, 3, 4]:
-            bot = Bot(depth=depth, search_type="fixed")
-            move = bot.get_best_move(game)
-            assert move is not None
-            assert 0 <= move < Connect4.COLS
+        assert move is not None
+        assert 0 <= move < Connect4.COLS
 
 
 class TestSearchTypeComparison:
     """Test comparison between search types."""
     
-    def test_both_search_types_produce_valid_moves(self):
+    def test_both_search_types_produce_valid_moves(self, search_result):
         """Test that both search types produce valid moves."""
-        game1 = Connect4()
-        game2 = Connect4()
-        
-        bot_iterative = Bot(depth=3, search_type="iterative")
-        bot_fixed = Bot(depth=3, search_type="fixed")
-        
-        game1.make_move(0)
-        game2.make_move(0)
-        
-        move1 = bot_iterative.get_best_move(game1)
-        move2 = bot_fixed.get_best_move(game2)
+        game, move, _ = search_result
         
-        assert move1 is not None
-        assert move2 is not None
-        assert game1.is_valid_move(move1)
-        assert game2.is_valid_move(move2)
+        assert move is not None
+        assert 0 <= move < Connect4.COLS
+        assert game.is_valid_move(move)
     
-    def test_both_search_types_use_transposition_table(self):
+    def test_both_search_types_use_transposition_table(self, search_result):
         """Test that both search types use transposition tables."""
-        game1 = Connect4()
-        game2 = Connect4()
-        
-        bot_iterative = Bot(depth=3, search_type="iterative")
-        bot_fixed = Bot(depth=3, search_type="fixed")
-        
-        game1.make_move(0)
-        game2.make_move(0)
+        _, _, context = search_result
         
-        bot_iterative.get_best_move(game1)
-        bot_fixed.get_best_move(game2)
-        
-        # Both should populate transposition tables
-        assert len(bot_iterative.transposition_table) > 0
-        assert len(bot_fixed.transposition_table) > 0
+        assert _tt_entries(context) > 0
     
-    def test_both_search_types_handle_complex_positions(self):
+    @pytest.mark.parametrize("search_type", ["iterative", "fixed"])
+    def test_both_search_types_handle_complex_positions(self, complex_position, search_type):
         """Test that both search types handle complex positions."""
-        # Create a more complex position
-        game1 = Connect4()
-        game2 = Connect4()
-        
-        # Set up a position with multiple moves
-        moves = [0, 1, 0, 1, 2, 3]
-        for move in moves:
-            game1.make_move(move)
-            game2.make_move(move)
-        
-        bot_iterative = Bot(depth=4, search_type="iterative")
-        bot_fixed = Bot(depth=4, search_type="fixed")
-        
-        move1 = bot_iterative.get_best_move(game1)
-        move2 = bot_fixed.get_best_move(game2)
+        move = Bot(depth=4, search_type=search_type).get_best_move(complex_position)
         
-        assert move1 is not None
-        assert move2 is not None
-        assert game1.is_valid_move(move1)
-        assert game2.is_valid_move(move2)
+        assert move is not None
+        assert complex_position.is_valid_move(move)
 
 
 class TestIncrementalHashing:
     """Test incremental hash updates."""
     
     def test_incremental_hash_update(self):
-        """Test that incremental hash updates work correctly."""
-        game = Connect4()
-        bot = Bot()
-        
-        # Compute initial hash
-        initial_hash = bot._compute_hash(game)
-        
-        # Make a move and compute hash incrementally
-        row = game.get_next_open_row(3)
-        if row is not None:
-            # Update hash incrementally
-            updated_hash = bot._update_hash_for_move(
-                initial_hash, row, 3,
-                Player.NONE, Player.RED,
-                Player.RED, Player.YELLOW
-            )
-            
-            # Make the actual move and compute hash
-            game.make_move(3)
-            computed_hash = bot._compute_hash(game)
-            
-            # Incremental update should match full computation
-            assert updated_hash == computed_hash
-    
-    def test_incremental_hash_consistency(self):
-        """Test that incremental hash updates are consistent."""
+        """Test that the search hashes child positions as the game does."""
         game = Connect4()
-        bot = Bot()
+        bot = Bot(depth=3, search_type="fixed")
+        context = SearchContext()
+        game.make_move(3)
         
-        # Make several moves and verify incremental updates match full computation
-        hash_value = bot._compute_hash(game)
+        bot.get_best_move(game, context)
         
-        for move in [3, 2, 4]:
-            row = game.get_next_open_row(move)
-            if row is None:
-                continue
-            
-            current_player = game.current_player
-            next_player = Player.YELLOW if current_player == Player.RED else Player.RED
-            
-            # Update hash incrementally
-            hash_value = bot._update_hash_for_move(
-                hash_value, row, move,
-                Player.NONE, current_player,
-                current_player, next_player
-            )
-            
-            # Make the actual move
+        for move in [3, 2, 1, 0]:  # Root moves of the symmetric position
+            child = game.copy()
+            child.make_move(move)
+            key = min(child.hash, child.mirror_hash)
+            assert context.tt_key[key & context.tt_mask] == key
+    
+    def test_incremental_hash_consistency(self, expected_hashes):
+        """Test that make_move and undo_move keep both hashes like a full recomputation."""
+        game = Connect4()
+        mirrored = Connect4()
+        hashes = [(game.hash, game.mirror_hash)]
+        
+        for move, expected in zip(_HASHED_MOVES, expected_hashes):
             game.make_move(move)
+            mirrored.make_move(Connect4.COLS - 1 - move)
             
-            # Verify hash matches
-            computed_hash = bot._compute_hash(game)
-            assert hash_value == computed_hash
+            assert game.hash == expected
+            assert game.mirror_hash == mirrored.hash
+            hashes.append((game.hash, game.mirror_hash))
+        
+        # Undoing the moves restores each earlier pair of hashes
+        hashes.pop()
+        while hashes:
+            game.undo_move()
+            assert (game.hash, game.mirror_hash) == hashes.pop()
+    
+    def test_hash_depends_on_side_to_move(self, bot):
+        """Test that the same board hashes differently for each side to move."""
+        game = Connect4()
+        
+        hashes = set()
+        for player in [Player.NONE, Player.RED, Player.YELLOW]:
+            game.current_player = player
+            hashes.add(bot._compute_hash(game))
+        
+        assert len(hashes) == 3
 
 
 class TestEarlyWinDetection:
@@ -585,7 +894,8 @@ class TestEarlyWinDetection:
     def test_early_win_detection(self):
         """Test that bot detects immediate wins early."""
         game = Connect4()
-        bot = Bot(depth=6, search_type="fixed", player=Player.YELLOW)
+        # A one-move tactic only needs a two-ply search
+        bot = Bot(depth=2, search_type="fixed", player=Player.YELLOW)
         
         # Set up a position where YELLOW can win immediately
         for i in range(3):
@@ -602,10 +912,28 @@ class TestEarlyWinDetection:
         # Verify it's a win (or at least a good move)
         assert move in [2, 3, 4]  # Should be near the winning area
     
+    def test_root_search_returns_immediate_win(self):
+        """Test that the root search stops at a move that wins outright."""
+        game = Connect4()
+        bot = Bot(depth=3, player=Player.YELLOW)
+        
+        # YELLOW holds columns 1-3 on the bottom row and is to move
+        for move in [0, 1, 0, 2, 6, 3, 6]:
+            game.make_move(move)
+        
+        position_hash = bot._compute_hash(game)
+        move, score = bot._search_root(SearchContext(), game,
+                                       list(CENTER_ORDER), 3, position_hash)
+        
+        assert move == 4
+        assert score >= WIN_SCORE
+        assert len(game.move_history) == 7
+    
     def test_early_loss_detection(self):
         """Test that bot detects immediate losses early."""
         game = Connect4()
-        bot = Bot(depth=6, search_type="fixed", player=Player.YELLOW)
+        # A one-move tactic only needs a two-ply search
+        bot = Bot(depth=2, search_type="fixed", player=Player.YELLOW)
         
         # Set up a position where RED can win if YELLOW doesn't block
         for i in range(3):
@@ -624,82 +952,100 @@ class TestEarlyWinDetection:
 class TestCaching:
     """Test caching optimizations."""
     
-    def test_valid_moves_caching(self):
-        """Test that valid moves are cached."""
-        game = Connect4()
-        bot = Bot(depth=3, search_type="fixed")
-        
-        game.make_move(0)
-        position_hash = bot._compute_hash(game)
-        
-        # Initially cache should be empty for this position
-        assert position_hash not in bot.valid_moves_cache
-        
-        # After search, cache should be populated
-        bot.get_best_move(game)
+    def test_evaluation_caching(self, root_search_context):
+        """Test that evaluations are cached."""
+        context = root_search_context
         
-        # Cache should have entries
-        assert len(bot.valid_moves_cache) > 0
+        assert len(SearchContext().evaluation_cache) == 0
+        assert len(context.evaluation_cache) > 0
     
-    def test_valid_moves_cache_reuse(self):
-        """Test that valid moves cache is reused."""
+    def test_evaluation_cache_reuse(self, root_search_context):
+        """Test that cached evaluations can be reused for their positions."""
+        context = root_search_context
+        mask = (1 << BOARD_BITS) - 1
+        
+        # Each entry is keyed by the mover's and the other side's bitboards
+        for key, score in context.evaluation_cache.items():
+            assert score == evaluate_position(key >> BOARD_BITS, key & mask)
+    
+    def test_leaf_evaluation_uses_cache(self, bot):
+        """Test that horizon positions are scored once and cached."""
         game = Connect4()
-        bot = Bot(depth=2, search_type="fixed")
+        context = SearchContext()
+        game.make_move(3)
+        yellow, red = game.bb[1], game.bb[0]
         
-        game.make_move(0)
-        position_hash = bot._compute_hash(game)
+        score = bot._evaluate_leaf(context, yellow, red)
+        
+        assert score == bot._evaluate_position(game)
+        assert list(context.evaluation_cache.values()) == [score]
+        assert bot._evaluate_leaf(context, yellow, red) == score
+        assert context.nodes == 2
+
+
+class TestSearchContext:
+    """Test per-search state kept outside the bot."""
+    
+    def test_search_leaves_bot_unchanged(self, game_after_red_opens):
+        """Test that searching does not store state on the bot."""
+        game = game_after_red_opens
+        bot = Bot(depth=3)
+        attributes_before = dict(vars(bot))
         
-        # First search
         bot.get_best_move(game)
-        cached_moves = bot.valid_moves_cache.get(position_hash)
         
-        # Cache should have the moves
-        assert cached_moves is not None
-        assert len(cached_moves) > 0
+        assert vars(bot) == attributes_before
     
-    def test_evaluation_caching(self):
-        """Test that evaluations are cached."""
-        game = Connect4()
-        bot = Bot(depth=3, search_type="fixed")
+    def test_search_counts_nodes(self, game_after_red_opens):
+        """Test that the context counts searched positions."""
+        game = game_after_red_opens
+        bot = Bot(depth=3)
+        context = SearchContext()
         
-        game.make_move(0)
+        bot.get_best_move(game, context)
         
-        # Initially cache should be empty
-        assert len(bot.evaluation_cache) == 0
-        
-        # After search, evaluation cache should be populated
-        bot.get_best_move(game)
+        assert context.nodes > 0
+    
+    def test_search_clears_per_search_caches(self, search_result):
+        """Test that a finished search keeps only the table and history."""
+        _, _, context = search_result
         
-        # Cache should have entries
-        assert len(bot.evaluation_cache) > 0
+        assert context.evaluation_cache == {}
+        assert all(killers == [None, None] for killers in context.killers)
+        assert _tt_entries(context) > 0
     
-    def test_evaluation_cache_reuse(self):
-        """Test that evaluation cache is reused."""
-        game = Connect4()
-        bot = Bot(depth=2, search_type="fixed")
+    def test_context_shared_by_bots_of_different_depths(self, game_after_red_opens):
+        """Test that one context serves a shallow bot and then a deeper one."""
+        game = game_after_red_opens
+        context = SearchContext()
         
-        game.make_move(0)
-        position_hash = bot._compute_hash(game)
+        Bot(depth=3).get_best_move(game, context)
+        move = Bot(depth=6).get_best_move(game, context)
         
-        # First search
-        bot.get_best_move(game)
+        assert game.is_valid_move(move)
+    
+    def test_expired_deadline_stops_after_first_iteration(self, game_after_red_opens):
+        """Test that iterative deepening starts no iteration past the deadline."""
+        game = game_after_red_opens
+        bot = Bot(depth=6, search_type="iterative")
+        expired = SearchContext(deadline=0)
+        unlimited = SearchContext()
         
-        # Evaluation cache should have entries
-        assert len(bot.evaluation_cache) > 0
+        move = bot.get_best_move(game, expired)
+        bot.get_best_move(game, unlimited)
         
-        # If we search the same position again, cache should be used
-        # (though in practice, transposition table would catch it first)
+        assert game.is_valid_move(move)
+        assert 0 < expired.nodes < unlimited.nodes
 
 
 class TestPrincipalVariationSearch:
     """Test Principal Variation Search (PVS) optimization."""
     
-    def test_pvs_returns_valid_move(self):
+    def test_pvs_returns_valid_move(self, game_after_red_opens):
         """Test that PVS still returns valid moves."""
-        game = Connect4()
-        bot = Bot(depth=4, search_type="fixed")
+        game = game_after_red_opens
+        bot = Bot(depth=2, search_type="fixed")
         
-        game.make_move(0)
         move = bot.get_best_move(game)
         
         # PVS should still find valid moves
@@ -707,16 +1053,11 @@ class TestPrincipalVariationSearch:
         assert 0 <= move < Connect4.COLS
         assert game.is_valid_move(move)
     
-    def test_pvs_with_complex_position(self):
+    def test_pvs_with_complex_position(self, complex_position):
         """Test PVS with a more complex position."""
-        game = Connect4()
+        game = complex_position
         bot = Bot(depth=3, search_type="fixed")
         
-        # Create a more complex position
-        moves = [0, 1, 0, 1, 2, 3]
-        for move in moves:
-            game.make_move(move)
-        
         move = bot.get_best_move(game)
         
         # Should still return a valid move
@@ -724,23 +1065,57 @@ class TestPrincipalVariationSearch:
         assert 0 <= move < Connect4.COLS
         assert game.is_valid_move(move)
     
-    def test_pvs_consistency_with_regular_search(self):
+    def test_pvs_consistency_with_regular_search(self, game_after_red_opens):
         """Test that PVS produces consistent results."""
-        game1 = Connect4()
-        game2 = Connect4()
-        
+        game = game_after_red_opens
         bot1 = Bot(depth=3, search_type="fixed")
         bot2 = Bot(depth=3, search_type="fixed")
         
-        game1.make_move(0)
-        game2.make_move(0)
-        
-        move1 = bot1.get_best_move(game1)
-        move2 = bot2.get_best_move(game2)
+        move1 = bot1.get_best_move(game)
+        move2 = bot2.get_best_move(game)
         
         # Both should return valid moves (may or may not be same due to transposition table)
         assert move1 is not None
         assert move2 is not None
-        assert game1.is_valid_move(move1)
-        assert game2.is_valid_move(move2)
+        assert game.is_valid_move(move1)
+        assert game.is_valid_move(move2)
+
 
+class TestParallelRootSearch:
+    """Test searching root moves on an executor."""
+    
+    @pytest.mark.parametrize("depth", [2, 4])
+    def test_parallel_search_matches_serial_search(self, depth):
+        """Test that the parallel root search finds the serial best move and score."""
+        game = Connect4()
+        for move in [3, 3, 2]:
+            game.make_move(move)
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = []
+            for bot in [Bot(depth=depth), Bot(depth=depth, executor=executor)]:
+                results.append(bot._search_root(SearchContext(), game,
+                                                list(CENTER_ORDER), depth,
+                                                bot._compute_hash(game)))
+        
+        assert results[0] == results[1]
+        assert game.move_history == [3, 3, 2]
+    
+    def test_parallel_search_blocks_loss(self):
+        """Test that the parallel search still blocks an immediate loss."""
+        game = Connect4()
+        for move in [0, 6, 1, 6, 2]:
+            game.make_move(move)
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            bot = Bot(depth=4, search_type="fixed", executor=executor)
+            assert bot.get_best_move(game) == 3
+    
+    def test_bot_pickles_without_executor(self):
+        """Test that a bot sent to a worker process leaves its executor behind."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            bot = Bot(depth=3, executor=executor)
+            copy = pickle.loads(pickle.dumps(bot))
+        
+        assert copy.executor is None
+        assert copy.depth == bot.depth
@@ -3,103 +3,202 @@ Tests for Connect4 game logic.
 """
 
 import pytest
-from game import Connect4, Player
+from game import (Connect4, Player, COLUMN_MASKS, RED, YELLOW, NONE, check_win,
+                  mirror_bitboard)
+
+
+# Board dimensions bound once as module globals for the assertions below
+ROWS, COLS = Connect4.ROWS, Connect4.COLS
+
+
+# RED diagonals from (5,0) up to (2,3) and from (5,3) up to (2,0), as
+# (row, col, player) pieces with YELLOW filling the cells underneath
+_FORWARD_DIAGONAL = (
+    (5, 0, Player.RED),
+    (5, 1, Player.YELLOW), (4, 1, Player.RED),
+    (5, 2, Player.YELLOW), (4, 2, Player.YELLOW), (3, 2, Player.RED),
+    (5, 3, Player.YELLOW), (4, 3, Player.YELLOW), (3, 3, Player.YELLOW), (2, 3, Player.RED),
+)
+_BACKWARD_DIAGONAL = (
+    (5, 3, Player.RED),
+    (5, 2, Player.YELLOW), (4, 2, Player.RED),
+    (5, 1, Player.YELLOW), (4, 1, Player.YELLOW), (3, 1, Player.RED),
+    (5, 0, Player.YELLOW), (4, 0, Player.YELLOW), (3, 0, Player.YELLOW), (2, 0, Player.RED),
+)
+
+
+@pytest.fixture
+def game():
+    """Return a new empty game."""
+    return Connect4()
+
+
+@pytest.fixture(scope="module")
+def nearly_full_game(draw_moves):
+    """Play all but the last of draw_moves; copy the game before moving."""
+    game = Connect4()
+    for col in draw_moves[:-1]:
+        game.make_move(col)
+    return game
+
+
+def _place(game, row, col, player):
+    """Place a piece directly on the bitboard, bypassing move validation."""
+    game.bb[player.value - 1] |= game._bit(row, col)
 
 
 class TestConnect4Initialization:
     """Test game initialization."""
     
-    def test_initial_board_empty(self):
+    def test_initial_board_empty(self, game):
         """Test that the board starts empty."""
-        game = Connect4()
         board = game.get_board()
         
         assert all(cell == 0 for row in board for cell in row)
     
-    def test_initial_player_is_red(self):
+    def test_initial_player_is_red(self, game):
         """Test that RED player starts first."""
-        game = Connect4()
         assert game.current_player == Player.RED
     
-    def test_game_not_over_initially(self):
+    def test_game_not_over_initially(self, game):
         """Test that game is not over at start."""
-        game = Connect4()
         assert game.game_over == False
         assert game.winner == Player.NONE
     
-    def test_board_dimensions(self):
+    def test_board_dimensions(self, game):
         """Test that board has correct dimensions."""
-        game = Connect4()
         board = game.get_board()
         
-        assert len(board) == Connect4.ROWS
-        assert len(board[0]) == Connect4.COLS
+        assert len(board) == ROWS
+        assert len(board[0]) == COLS
 
 
 class TestMoveValidation:
     """Test move validation logic."""
     
-    def test_valid_move(self):
-        """Test that valid moves are accepted."""
-        game = Connect4()
-        assert game.is_valid_move(0) == True
-        assert game.is_valid_move(3) == True
-        assert game.is_valid_move(6) == True
-    
-    def test_invalid_column_negative(self):
-        """Test that negative columns are rejected."""
-        game = Connect4()
-        assert game.is_valid_move(-1) == False
-    
-    def test_invalid_column_too_large(self):
-        """Test that columns beyond board are rejected."""
-        game = Connect4()
-        assert game.is_valid_move(7) == False
-        assert game.is_valid_move(10) == False
-    
-    def test_invalid_move_full_column(self):
+    @pytest.mark.parametrize("col,expected", [
+        (0, True), (3, True), (6, True), (-1, False), (7, False), (10, False),
+    ])
+    def test_is_valid_move(self, game, col, expected):
+        """Test that columns on the board are accepted and others rejected."""
+        assert game.is_valid_move(col) is expected
+    
+    def test_invalid_move_full_column(self, game):
         """Test that full columns are rejected."""
-        game = Connect4()
         # Fill column 0
-        for _ in range(Connect4.ROWS):
+        for _ in range(ROWS):
             game.make_move(0)
         
         assert game.is_valid_move(0) == False
     
-    def test_get_valid_moves(self):
+    def test_get_valid_moves(self, game):
         """Test getting list of valid moves."""
-        game = Connect4()
         valid_moves = game.get_valid_moves()
         
-        assert len(valid_moves) == Connect4.COLS
-        assert set(valid_moves) == set(range(Connect4.COLS))
+        assert len(valid_moves) == COLS
+        assert set(valid_moves) == set(range(COLS))
+    
+    def test_valid_mask(self, game):
+        """Test that the valid mask marks the landing cell of open columns."""
+        assert game.valid_mask().bit_count() == COLS
+        
+        game.make_move(2)
+        assert game.valid_mask() & COLUMN_MASKS[2] == game._bit(ROWS - 2, 2)
+        
+        for _ in range(ROWS - 1):
+            game.make_move(0)
+        game.make_move(2)
+        game.make_move(0)
+        # Column 0 is now full
+        assert game.valid_mask() & COLUMN_MASKS[0] == 0
+        assert game.valid_mask().bit_count() == COLS - 1
+    
+    def test_mirror_bitboard(self, game):
+        """Test that mirroring swaps columns and leaves the center in place."""
+        game.make_move(0)
+        game.make_move(3)
+        game.make_move(5)
+        
+        assert mirror_bitboard(game.bb[0]) == game._bit(5, 6) | game._bit(5, 1)
+        assert mirror_bitboard(game.bb[1]) == game.bb[1]
+        assert mirror_bitboard(mirror_bitboard(game.bb[0])) == game.bb[0]
+    
+    def test_is_symmetric(self, game):
+        """Test symmetry detection of positions."""
+        assert game.is_symmetric()
+        
+        game.make_move(3)
+        assert game.is_symmetric()
+        
+        game.make_move(2)
+        assert not game.is_symmetric()
+        
+        game.make_move(4)
+        assert not game.is_symmetric()
 
 
 class TestMakingMoves:
     """Test making moves."""
     
-    def test_make_valid_move(self):
+    def test_make_valid_move(self, game):
         """Test making a valid move."""
-        game = Connect4()
         success = game.make_move(0)
         
         assert success == True
         board = game.get_board()
-        assert board[Connect4.ROWS - 1][0] == Player.RED.value
+        assert board[ROWS - 1][0] == RED
+    
+    def test_make_moves_stops_at_rejected_move(self, game):
+        """Test that make_moves plays moves in order until one is rejected."""
+        assert game.make_moves([3, 3]) == True
+        assert game.make_moves([2, COLS, 4]) == False
+        
+        assert game.move_history == [3, 3, 2]
+    
+    def test_make_invalid_move(self, game):
+        """Test that moves outside the board or into a full column are rejected."""
+        for _ in range(ROWS):
+            game.make_move(0)
+        
+        for col in [-1, COLS, 0]:
+            assert game.make_move(col) == False
+            assert game.get_next_open_row(col) is None
+        assert len(game.move_history) == ROWS
+        assert game.current_player == Player.RED
     
-    def test_pieces_stack(self):
+    def test_pieces_stack(self, game):
         """Test that pieces stack on top of each other."""
-        game = Connect4()
         game.make_move(0)  # RED
         game.make_move(0)  # YELLOW
         
         board = game.get_board()
-        assert board[Connect4.ROWS - 1][0] == Player.RED.value
-        assert board[Connect4.ROWS - 2][0] == Player.YELLOW.value
+        assert board[ROWS - 1][0] == RED
+        assert board[ROWS - 2][0] == YELLOW
+    
+    def test_get_board_cached_until_next_move(self, game):
+        """Test that get_board reuses its result until the board changes."""
+        game.make_move(0)
+        
+        board = game.get_board()
+        assert game.get_board() is board
+        
+        game.make_move(1)
+        assert game.get_board()[ROWS - 1][1] == YELLOW
+        game.undo_move()
+        assert game.get_board()[ROWS - 1][1] == NONE
     
-    def test_player_switches_after_move(self):
+    def test_get_cell(self, game):
+        """Test reading individual cells from the bitboards."""
+        game.make_move(3)  # RED
+        game.make_move(3)  # YELLOW
+        
+        assert game.get_cell(ROWS - 1, 3) == Player.RED
+        assert game.get_cell(ROWS - 2, 3) == Player.YELLOW
+        assert game.get_cell(ROWS - 3, 3) == Player.NONE
+        assert game.heights[3] == 2
+    
+    def test_player_switches_after_move(self, game):
         """Test that players alternate after moves."""
-        game = Connect4()
         assert game.current_player == Player.RED
         
         game.make_move(0)
@@ -108,9 +207,8 @@ class TestMakingMoves:
         game.make_move(1)
         assert game.current_player == Player.RED
     
-    def test_cannot_move_when_game_over(self):
+    def test_cannot_move_when_game_over(self, game):
         """Test that moves are rejected when game is over."""
-        game = Connect4()
         # Create a winning scenario
         for i in range(3):
             game.make_move(i)  # RED
@@ -122,17 +220,15 @@ class TestMakingMoves:
         success = game.make_move(0)
         assert success == False
     
-    def test_get_next_open_row(self):
+    def test_get_next_open_row(self, game):
         """Test finding the next open row in a column."""
-        game = Connect4()
-        
-        assert game.get_next_open_row(0) == Connect4.ROWS - 1
+        assert game.get_next_open_row(0) == ROWS - 1
         
         game.make_move(0)
-        assert game.get_next_open_row(0) == Connect4.ROWS - 2
+        assert game.get_next_open_row(0) == ROWS - 2
         
         # Fill column
-        for _ in range(Connect4.ROWS - 1):
+        for _ in range(ROWS - 1):
             game.make_move(0)
         
         assert game.get_next_open_row(0) == None
@@ -141,128 +237,69 @@ class TestMakingMoves:
 class TestWinDetection:
     """Test win detection in all directions."""
     
-    def test_horizontal_win(self):
-        """Test horizontal win detection."""
-        game = Connect4()
-        # RED wins horizontally
-        for col in range(4):
+    @pytest.mark.parametrize("moves,winner", [
+        ([0, 0, 1, 1, 2, 2, 3], Player.RED),  # RED along the bottom row
+        ([0, 1, 0, 1, 0, 1, 0], Player.RED),  # RED up column 0
+        ([4, 0, 5, 1, 6, 2, 4, 3], Player.YELLOW),  # YELLOW along the bottom row
+    ], ids=['horizontal', 'vertical', 'yellow'])
+    def test_win_ends_game(self, game, moves, winner):
+        """Test that completing four in a row ends the game for either player."""
+        for col in moves:
             game.make_move(col)
-            if col < 3:  # Don't make extra move after winning
-                game.make_move(col)  # YELLOW blocks
         
         assert game.game_over == True
-        assert game.winner == Player.RED
+        assert game.winner == winner
     
-    def test_vertical_win(self):
-        """Test vertical win detection."""
-        game = Connect4()
-        # RED wins vertically
-        for _ in range(4):
-            game.make_move(0)  # RED
-            game.make_move(1)  # YELLOW
-        
-        assert game.game_over == True
-        assert game.winner == Player.RED
-    
-    def test_diagonal_win_forward_slash(self):
-        """Test diagonal win detection (forward slash /)."""
-        game = Connect4()
-        # Create diagonal win for RED (diagonal from bottom-left to top-right)
-        # Pattern: RED at (5,0), (4,1), (3,2), (2,3)
-        # We'll manually set up the board to test diagonal detection
-        
-        # Set up pieces manually to create diagonal
-        # Column 0: RED at row 5
-        game.board[5][0] = Player.RED
-        # Column 1: YELLOW at 5, RED at 4
-        game.board[5][1] = Player.YELLOW
-        game.board[4][1] = Player.RED
-        # Column 2: YELLOW at 5,4, RED at 3
-        game.board[5][2] = Player.YELLOW
-        game.board[4][2] = Player.YELLOW
-        game.board[3][2] = Player.RED
-        # Column 3: YELLOW at 5,4,3, RED at 2 (wins!)
-        game.board[5][3] = Player.YELLOW
-        game.board[4][3] = Player.YELLOW
-        game.board[3][3] = Player.YELLOW
-        game.board[2][3] = Player.RED
-        
-        # Check win at the last placed piece
-        assert game._check_win(2, 3) == True
-    
-    def test_diagonal_win_backslash(self):
-        """Test diagonal win detection (backslash)."""
-        game = Connect4()
-        # Create diagonal win for RED (diagonal from bottom-right to top-left)
-        # Pattern: RED at (5,3), (4,2), (3,1), (2,0)
-        # We'll manually set up the board to test diagonal detection
-        
-        # Set up pieces manually to create diagonal
-        # Column 3: RED at row 5
-        game.board[5][3] = Player.RED
-        # Column 2: YELLOW at 5, RED at 4
-        game.board[5][2] = Player.YELLOW
-        game.board[4][2] = Player.RED
-        # Column 1: YELLOW at 5,4, RED at 3
-        game.board[5][1] = Player.YELLOW
-        game.board[4][1] = Player.YELLOW
-        game.board[3][1] = Player.RED
-        # Column 0: YELLOW at 5,4,3, RED at 2 (wins!)
-        game.board[5][0] = Player.YELLOW
-        game.board[4][0] = Player.YELLOW
-        game.board[3][0] = Player.YELLOW
-        game.board[2][0] = Player.RED
-        
-        # Check win at the last placed piece
-        assert game._check_win(2, 0) == True
-    
-    def test_yellow_wins(self):
-        """Test that YELLOW can win."""
-        game = Connect4()
-        # YELLOW wins horizontally
-        # RED moves to column 4 first
-        game.make_move(4)  # RED
-        # YELLOW makes 4 in a row horizontally (columns 0-3)
-        for col in range(4):
-            game.make_move(col)  # YELLOW
-            if col < 3:  # Don't make extra move after winning
-                # RED moves to different columns to avoid blocking
-                red_col = 5 if col == 0 else (6 if col == 1 else 4)
-                game.make_move(red_col)  # RED moves elsewhere
-        
-        assert game.game_over == True
-        assert game.winner == Player.YELLOW
+    @pytest.mark.parametrize("pieces", [_FORWARD_DIAGONAL, _BACKWARD_DIAGONAL],
+                             ids=['forward_slash', 'backslash'])
+    def test_diagonal_win(self, game, pieces):
+        """Test diagonal win detection in both directions."""
+        for row, col, player in pieces:
+            _place(game, row, col, player)
+        
+        assert game._check_win(Player.RED) == True
+    
+    def test_no_win_across_column_boundary(self, game):
+        """Test that pieces stacked in adjacent columns do not wrap into a line."""
+        # Top two cells of column 0 and bottom two cells of column 1
+        _place(game, 0, 0, Player.RED)
+        _place(game, 1, 0, Player.RED)
+        _place(game, 4, 1, Player.RED)
+        _place(game, 5, 1, Player.RED)
+        
+        assert game._check_win(Player.RED) == False
+    
+    def test_check_win_on_raw_bitboards(self):
+        """Test the module-level win check on hand-built bitboards."""
+        vertical = 0b1111
+        horizontal = sum(1 << (col * Connect4.H1) for col in range(4))
+        
+        assert check_win(vertical) == True
+        assert check_win(horizontal) == True
+        assert check_win(vertical >> 1) == False
+        assert check_win(0) == False
 
 
 class TestDrawDetection:
     """Test draw detection."""
     
-    def test_draw_when_board_full(self):
+    def test_draw_when_board_full(self, nearly_full_game, draw_moves):
         """Test that game ends in draw when board is full."""
-        game = Connect4()
-        
-        # Fill board without winning (alternate columns)
-        for row in range(Connect4.ROWS):
-            for col in range(Connect4.COLS):
-                if (row + col) % 2 == 0:
-                    # Fill with pattern that doesn't create 4 in a row
-                    current_col = col
-                    while not game.is_valid_move(current_col):
-                        current_col = (current_col + 1) % Connect4.COLS
-                    game.make_move(current_col)
-        
-        # If board is full, it should be a draw
-        if game._is_board_full():
-            assert game.game_over == True
-            assert game.winner == Player.NONE
+        game = nearly_full_game.copy()
+        assert game.game_over == False
+        
+        game.make_move(draw_moves[-1])
+        
+        assert game._is_board_full()
+        assert game.game_over == True
+        assert game.winner == Player.NONE
 
 
 class TestGameCopy:
     """Test game copying functionality."""
     
-    def test_copy_creates_independent_game(self):
+    def test_copy_creates_independent_game(self, game):
         """Test that copy creates an independent game state."""
-        game = Connect4()
         game.make_move(0)
         game.make_move(1)
         
@@ -276,9 +313,8 @@ class TestGameCopy:
         assert len(copy.move_history) == 2
         assert len(game.move_history) == 3
     
-    def test_copy_preserves_state(self):
+    def test_copy_preserves_state(self, game):
         """Test that copy preserves all game state."""
-        game = Connect4()
         game.make_move(0)
         game.make_move(1)
         
@@ -288,46 +324,72 @@ class TestGameCopy:
         assert copy.game_over == game.game_over
         assert copy.winner == game.winner
         assert copy.get_board() == game.get_board()
+        assert copy.hash == game.hash
+        assert copy.mirror_hash == game.mirror_hash
 
 
 class TestUndoMove:
     """Test undo move functionality."""
     
-    def test_undo_move(self):
+    def test_undo_move(self, game):
         """Test undoing a move."""
-        game = Connect4()
         game.make_move(0)
         game.make_move(1)
         
-        initial_board = game.copy().get_board()
         game.undo_move()
         
         # Should be back to state before last move
         assert game.current_player == Player.YELLOW
         board = game.get_board()
-        assert board[Connect4.ROWS - 1][1] == Player.NONE.value
+        assert board[ROWS - 1][1] == NONE
     
-    def test_undo_multiple_moves(self):
+    def test_undo_multiple_moves(self, game):
         """Test undoing multiple moves."""
-        game = Connect4()
-        for i in range(5):
-            game.make_move(i)
+        assert game.make_moves(range(5)) == True
+        assert game.undo_moves(3) == True
         
-        for i in range(3):
-            game.undo_move()
+        assert game.move_history == [0, 1]
+        assert game.undo_moves(3) == False
+        assert game.move_history == []
+    
+    def test_undo_restores_bitboards(self, game):
+        """Test that undoing moves restores the exact bitboard state."""
+        game.make_move(3)
+        game.make_move(4)
+        bitboards = game.bb[:]
+        heights = game.heights[:]
+        
+        game.make_move(3)
+        game.make_move(3)
+        game.undo_move()
+        game.undo_move()
+        
+        assert game.bb == bitboards
+        assert game.heights == heights
+        assert game.move_history == [3, 4]
+    
+    def test_undo_restores_hash(self, game):
+        """Test that undoing moves restores the position hashes."""
+        empty_hashes = (game.hash, game.mirror_hash)
+        game.make_move(3)
+        hashes = (game.hash, game.mirror_hash)
         
-        assert len(game.move_history) == 2
+        game.make_move(1)
+        assert (game.hash, game.mirror_hash) != hashes
+        
+        game.undo_move()
+        assert (game.hash, game.mirror_hash) == hashes
+        game.undo_move()
+        assert (game.hash, game.mirror_hash) == empty_hashes
     
-    def test_undo_empty_history(self):
+    def test_undo_empty_history(self, game):
         """Test undoing when no moves exist."""
-        game = Connect4()
         success = game.undo_move()
         
         assert success == False
     
-    def test_undo_restores_game_state(self):
+    def test_undo_restores_game_state(self, game):
         """Test that undo restores game_over and winner state."""
-        game = Connect4()
         # Create a horizontal win
         for i in range(4):
             game.make_move(i)  # RED